@@ -0,0 +1,343 @@
+"""
+Offline analytics over the stored history.
+
+    python -m app.analytics
+    python -m app.analytics --days 30 --bucket 3600 --horizon 6 --dry-run
+
+Bulk-loads TaoDividend, SentimentAnalysis and StakeOperation documents into
+NumPy columns and bins them on a (subnet x time bucket) grid. From there:
+
+- the mean sentiment of each bucket is correlated with the subnet's dividend
+  change over the following `horizon` buckets;
+- staking rules, including the live 0.01 TAO x score rule and the stake
+  operations actually recorded, are backtested against the per-bucket
+  dividend changes for all subnets and rules at once.
+
+Dividend change is the mean relative change between consecutive reads of each
+(netuid, hotkey) series. A staked position earns the next bucket's change;
+unstaking never takes a position below zero. Results go to the
+analytics_results collection unless --dry-run is given.
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+from itertools import repeat
+from operator import itemgetter, sub
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from app.db.models import AnalyticsResult, SentimentAnalysis, StakeOperation, TaoDividend, close_db, init_db
+from app.utils.log import setup_logging
+
+Columns = Dict[str, np.ndarray]
+
+_EPOCH = datetime(1970, 1, 1)
+
+# Projections loaded per collection, with the column dtype. Timestamps become
+# int64 epoch seconds; "category" columns become int codes (hotkeys repeat a
+# lot, and sorting codes is far cheaper than sorting 48-char strings).
+DIVIDEND_FIELDS = {"netuid": np.int64, "hotkey": "category", "dividend": np.float64, "timestamp": "datetime64[s]"}
+SENTIMENT_FIELDS = {"netuid": np.int64, "sentiment_score": np.float64, "timestamp": "datetime64[s]"}
+OPERATION_FIELDS = {
+    "netuid": np.int64, "operation_type": str, "amount": np.float64,
+    "successful": np.bool_, "timestamp": "datetime64[s]",
+}
+
+# Trade size (TAO) per sentiment record, as a function of the score array.
+# "live" is what perform_sentiment_based_staking does today.
+RULES: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "live": lambda score: 0.01 * score,
+    "threshold_50": lambda score: np.where(np.abs(score) >= 50, 0.01 * score, 0.0),
+    "long_only": lambda score: 0.01 * np.clip(score, 0, None),
+    "fixed_size": lambda score: 0.5 * np.sign(score),
+}
+# Pseudo-rule replaying the successful StakeOperations
+RECORDED = "recorded"
+
+
+def to_columns(documents, fields: Dict[str, object], codes: Optional[Dict[str, dict]] = None) -> Columns:
+    """
+    Turn one batch of projected documents (dicts) into one array per field.
+    Pass the same `codes` for every batch so category codes stay consistent.
+    """
+    codes = {} if codes is None else codes
+    return {
+        field: _as_array(documents, field, dtype, codes.setdefault(field, {}))
+        for field, dtype in fields.items()
+    }
+
+
+def _as_array(documents, field: str, dtype, codes: dict) -> np.ndarray:
+    # map/itemgetter keep the per-document work in C; this runs for every row
+    count = len(documents)
+    values = map(itemgetter(field), documents)
+    if dtype == "category":
+        values = list(values)
+        for value in dict.fromkeys(values):
+            codes.setdefault(value, len(codes))
+        return np.fromiter(map(codes.__getitem__, values), dtype=np.int64, count=count)
+    if dtype == "datetime64[s]":
+        # Naive UTC datetimes (as pymongo returns them). Subtracting the epoch
+        # is several times faster than NumPy parsing datetime objects.
+        seconds = map(timedelta.total_seconds, map(sub, values, repeat(_EPOCH)))
+        return np.fromiter(seconds, dtype=np.float64, count=count).astype(np.int64)
+    if dtype is str:
+        return np.array(list(values), dtype=str)
+    return np.fromiter(values, dtype=dtype, count=count)
+
+
+def concat_columns(batches, fields: Dict[str, object]) -> Columns:
+    """Join per-batch columns; empty (but typed) columns if there were none."""
+    if not batches:
+        return to_columns([], fields)
+    return {field: np.concatenate([batch[field] for batch in batches]) for field in fields}
+
+
+async def load_history(engine, since: Optional[datetime] = None, batch_size: int = 50_000) -> Tuple[Columns, Columns, Columns]:
+    """
+    Load dividends, sentiment and stake operations as columns. Each cursor
+    batch becomes arrays as it arrives, so at most one batch of documents is
+    held as Python objects.
+    """
+    query = {"timestamp": {"$gte": since}} if since else {}
+
+    async def load(model, fields):
+        collection = engine.get_collection(model)
+        projection = {field: 1 for field in fields}
+        projection["_id"] = 0
+        cursor = collection.find(query, projection, batch_size=batch_size)
+        codes, batches, rows = {}, [], 0
+        while True:
+            documents = await cursor.to_list(length=batch_size)
+            if not documents:
+                break
+            batches.append(to_columns(documents, fields, codes))
+            rows += len(documents)
+        logger.info("Loaded {} {} documents", rows, model.__name__)
+        return concat_columns(batches, fields)
+
+    return (
+        await load(TaoDividend, DIVIDEND_FIELDS),
+        await load(SentimentAnalysis, SENTIMENT_FIELDS),
+        await load(StakeOperation, OPERATION_FIELDS),
+    )
+
+
+class Grid:
+    """Maps (netuid, timestamp) to cells of a subnets x buckets matrix."""
+
+    def __init__(self, netuids: np.ndarray, start: int, end: int, bucket: int):
+        self.netuids = netuids
+        self.start = start
+        self.bucket = bucket
+        self.shape = (len(netuids), int((end - start) // bucket) + 1)
+
+    @classmethod
+    def covering(cls, *tables: Columns, bucket: int) -> "Grid":
+        stamps = [table["timestamp"] for table in tables if len(table["timestamp"])]
+        netuids = np.unique(np.concatenate([table["netuid"] for table in tables]))
+        if not stamps:
+            return cls(netuids, 0, 0, bucket)
+        return cls(
+            netuids,
+            int(min(stamp.min() for stamp in stamps)),
+            int(max(stamp.max() for stamp in stamps)),
+            bucket,
+        )
+
+    def cells(self, table: Columns) -> np.ndarray:
+        rows = np.searchsorted(self.netuids, table["netuid"])
+        cols = (table["timestamp"] - self.start) // self.bucket
+        return rows * self.shape[1] + cols
+
+    def total(self, cells: np.ndarray, values: np.ndarray) -> np.ndarray:
+        size = self.shape[0] * self.shape[1]
+        return np.bincount(cells, weights=values, minlength=size).reshape(self.shape)
+
+    def mean(self, cells: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """Per-cell mean; NaN where a cell has no values."""
+        size = self.shape[0] * self.shape[1]
+        counts = np.bincount(cells, minlength=size).reshape(self.shape)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.total(cells, values) / counts
+
+
+def dividend_changes(dividends: Columns) -> Tuple[np.ndarray, Columns]:
+    """
+    Relative change between consecutive reads of each (netuid, hotkey) series.
+    Returns the changes and the (netuid, timestamp) columns of the later reads.
+    """
+    # One integer per series; np.unique only if hotkeys are not codes already
+    hotkey = dividends["hotkey"]
+    if not np.issubdtype(hotkey.dtype, np.integer):
+        _, hotkey = np.unique(hotkey, return_inverse=True)
+    series = dividends["netuid"] * (int(hotkey.max(initial=0)) + 1) + hotkey
+    stamp = dividends["timestamp"]
+
+    # Sort by series then time: a single int64 key when it fits, else lexsort
+    offset = stamp - stamp.min(initial=0)
+    span = int(offset.max(initial=0)) + 1
+    if (int(series.max(initial=0)) + 1) * span < 2**63:
+        order = np.argsort(series * span + offset)
+    else:
+        order = np.lexsort((stamp, series))
+    series = series[order]
+    value = dividends["dividend"][order]
+    stamp = stamp[order]
+    netuid = dividends["netuid"][order]
+
+    same_series = series[1:] == series[:-1]
+    previous = value[:-1]
+    valid = same_series & (previous > 0)
+    change = (value[1:][valid] - previous[valid]) / previous[valid]
+    return change, {"netuid": netuid[1:][valid], "timestamp": stamp[1:][valid]}
+
+
+def forward_sum(matrix: np.ndarray, horizon: int) -> np.ndarray:
+    """Sum of the next `horizon` buckets along axis 1 (NaN if all are missing)."""
+    present = np.isfinite(matrix)
+    padded = np.zeros((matrix.shape[0], matrix.shape[1] + 1))
+    counts = np.zeros_like(padded)
+    padded[:, 1:] = np.cumsum(np.where(present, matrix, 0.0), axis=1)
+    counts[:, 1:] = np.cumsum(present, axis=1)
+
+    result = np.full(matrix.shape, np.nan)
+    width = matrix.shape[1] - horizon
+    if width > 0:
+        # buckets t+1 .. t+horizon
+        total = padded[:, horizon + 1:] - padded[:, 1:width + 1]
+        count = counts[:, horizon + 1:] - counts[:, 1:width + 1]
+        result[:, :width] = np.where(count > 0, total, np.nan)
+    return result
+
+
+def masked_correlation(x: np.ndarray, y: np.ndarray, axis: Optional[int] = 1, min_samples: int = 3):
+    """Pearson correlation over the positions where both x and y are finite."""
+    mask = np.isfinite(x) & np.isfinite(y)
+    n = mask.sum(axis=axis)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_x = np.where(mask, x, 0.0).sum(axis=axis) / n
+        mean_y = np.where(mask, y, 0.0).sum(axis=axis) / n
+        if axis is not None:
+            mean_x, mean_y = np.expand_dims(mean_x, axis), np.expand_dims(mean_y, axis)
+        dx = np.where(mask, x - mean_x, 0.0)
+        dy = np.where(mask, y - mean_y, 0.0)
+        r = (dx * dy).sum(axis=axis) / np.sqrt((dx * dx).sum(axis=axis) * (dy * dy).sum(axis=axis))
+    return np.where(n >= min_samples, r, np.nan), n
+
+
+def backtest(trades: np.ndarray, returns: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Replay trades (rules x subnets x buckets, TAO) against per-bucket returns
+    (subnets x buckets). Vectorized over rules and subnets; steps through time
+    because positions are floored at zero.
+    """
+    returns = np.nan_to_num(returns)
+    position = np.zeros(trades.shape[:2])
+    pnl = np.zeros(trades.shape[:2])
+    turnover = np.zeros(trades.shape[:2])
+    exposure = np.zeros(trades.shape[:2])
+    for t in range(trades.shape[2] - 1):
+        updated = np.maximum(position + trades[:, :, t], 0.0)
+        turnover += np.abs(updated - position)
+        position = updated
+        # Positions taken in bucket t earn the change observed in bucket t+1
+        pnl += position * returns[:, t + 1]
+        exposure += position
+    return {"pnl": pnl, "turnover": turnover, "final_position": position, "exposure": exposure}
+
+
+def analyze(dividends: Columns, sentiment: Columns, operations: Columns,
+            bucket: int = 3600, horizon: int = 1, min_samples: int = 3) -> Dict[str, dict]:
+    """Run the correlation and the backtests; returns result documents by kind."""
+    change, change_at = dividend_changes(dividends)
+    grid = Grid.covering(change_at, sentiment, operations, bucket=bucket)
+    bucket_change = grid.mean(grid.cells(change_at), change)
+
+    sentiment_cells = grid.cells(sentiment)
+    score = sentiment["sentiment_score"]
+    mean_score = grid.mean(sentiment_cells, score)
+    future_change = forward_sum(bucket_change, horizon)
+    per_subnet, samples = masked_correlation(mean_score, future_change, min_samples=min_samples)
+    overall, overall_samples = masked_correlation(mean_score.ravel(), future_change.ravel(), axis=None,
+                                                  min_samples=min_samples)
+
+    successful = operations["successful"]
+    direction = np.where(operations["operation_type"][successful] == "stake", 1.0, -1.0)
+    recorded = grid.total(grid.cells({k: v[successful] for k, v in operations.items()}),
+                          direction * operations["amount"][successful])
+    names = list(RULES) + [RECORDED]
+    trades = np.stack([grid.total(sentiment_cells, rule(score)) for rule in RULES.values()] + [recorded])
+    outcome = backtest(trades, bucket_change)
+
+    netuids = grid.netuids.tolist()
+    return {
+        "sentiment_dividend_correlation": {
+            "overall": {"correlation": _number(overall), "samples": int(overall_samples)},
+            "subnets": [
+                {"netuid": netuid, "correlation": _number(r), "samples": int(n)}
+                for netuid, r, n in zip(netuids, per_subnet, samples)
+            ],
+        },
+        "backtest": {
+            name: {
+                "pnl": _number(outcome["pnl"][i].sum()),
+                "turnover": _number(outcome["turnover"][i].sum()),
+                "final_position": _number(outcome["final_position"][i].sum()),
+                "return_on_exposure": _number(outcome["pnl"][i].sum() / outcome["exposure"][i].sum())
+                if outcome["exposure"][i].sum() else None,
+                "subnets": [
+                    {"netuid": netuid, "pnl": _number(pnl), "final_position": _number(position)}
+                    for netuid, pnl, position in zip(netuids, outcome["pnl"][i], outcome["final_position"][i])
+                ],
+            }
+            for i, name in enumerate(names)
+        },
+    }
+
+
+def _number(value) -> Optional[float]:
+    value = float(value)
+    return round(value, 6) if np.isfinite(value) else None
+
+
+async def main(days: Optional[int], bucket: int, horizon: int, min_samples: int, dry_run: bool):
+    engine = await init_db()
+    try:
+        since = datetime.utcnow() - timedelta(days=days) if days else None
+        started = time.perf_counter()
+        dividends, sentiment, operations = await load_history(engine, since)
+        loaded = time.perf_counter()
+        results = analyze(dividends, sentiment, operations, bucket, horizon, min_samples)
+        logger.info("Loaded in {:.1f}s, analyzed in {:.1f}s", loaded - started, time.perf_counter() - loaded)
+
+        correlation = results["sentiment_dividend_correlation"]["overall"]
+        logger.info("Sentiment vs dividend change: r={} over {} buckets", correlation["correlation"],
+                    correlation["samples"])
+        for name, outcome in results["backtest"].items():
+            logger.info("Rule {}: pnl={} turnover={} return/exposure={}", name, outcome["pnl"],
+                        outcome["turnover"], outcome["return_on_exposure"])
+
+        if not dry_run:
+            params = {"days": days, "bucket": bucket, "horizon": horizon, "min_samples": min_samples}
+            for kind, result in results.items():
+                await engine.save(AnalyticsResult(kind=kind, params=params, results=result))
+            logger.info("Results saved to analytics_results")
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, help="Only use the last N days (default: all history)")
+    parser.add_argument("--bucket", type=int, default=3600, help="Time bucket in seconds")
+    parser.add_argument("--horizon", type=int, default=1, help="Buckets of dividend change to correlate with")
+    parser.add_argument("--min-samples", type=int, default=3, help="Buckets needed for a subnet correlation")
+    parser.add_argument("--dry-run", action="store_true", help="Log results without saving them")
+    args = parser.parse_args()
+
+    setup_logging()
+    asyncio.run(main(args.days, args.bucket, args.horizon, args.min_samples, args.dry_run))
@@ -5,6 +5,8 @@ import jwt
 import os
 from loguru import logger
 
+from app.utils.log import sampled_logger
+
 # API token header setup
 API_KEY_NAME = "Authorization"
 api_key_header = APIKeyHeader(name=API_KEY_NAME, auto_error=False)
@@ -27,7 +29,7 @@ async def get_api_key(api_key_header: str = Security(api_key_header)):
     parts = api_key_header.split()
     
     if len(parts) != 2 or parts[0].lower() != "bearer":
-        logger.warning(f"Invalid Authorization header format: {api_key_header}")
+        logger.warning("Invalid Authorization header format")
         raise HTTPException(
             status_code=HTTP_403_FORBIDDEN, 
             detail="Authorization header must be in the format 'Bearer <token>'"
@@ -38,7 +40,7 @@ async def get_api_key(api_key_header: str = Security(api_key_header)):
     try:
         # Decode and validate the JWT token
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        logger.info(f"Token validated successfully: {payload}")
+        sampled_logger.debug("Token validated for {}", payload.get("sub"))
         return payload  # Return the decoded payload for further use
     except jwt.ExpiredSignatureError:
         logger.warning("Token has expired")
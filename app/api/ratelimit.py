@@ -0,0 +1,172 @@
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from fastapi import Depends, HTTPException, Request, Response
+from starlette.status import HTTP_429_TOO_MANY_REQUESTS
+from loguru import logger
+
+from app.api.auth import get_api_key
+from app.cache.redis import redis_client
+from app.utils.config import settings
+
+# Sliding window (sorted set of request timestamps) plus a daily counter per
+# limit. All limits for a request are checked in one script call (one round
+# trip), and counters are only written if every limit allows the request.
+# KEYS: window and quota key per limit. ARGV: now (ms), quota ttl, request id,
+# then window (ms), limit and quota per limit.
+# Returns {rejected limit index or 0, then remaining, reset_seconds,
+# quota_remaining per limit}.
+RATE_LIMIT_SCRIPT = """
+local now = tonumber(ARGV[1])
+local quota_ttl = tonumber(ARGV[2])
+local member = ARGV[3]
+local n = #KEYS / 2
+local windows, limits, quotas, counts, used = {}, {}, {}, {}, {}
+
+local function window_reset(key, window)
+    local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+    if oldest[2] then
+        return math.ceil((tonumber(oldest[2]) + window - now) / 1000)
+    end
+    return math.ceil(window / 1000)
+end
+
+local rejected = 0
+for i = 1, n do
+    local arg = 3 + (i - 1) * 3
+    windows[i] = tonumber(ARGV[arg + 1])
+    limits[i] = tonumber(ARGV[arg + 2])
+    quotas[i] = tonumber(ARGV[arg + 3])
+    redis.call('ZREMRANGEBYSCORE', KEYS[2 * i - 1], 0, now - windows[i])
+    counts[i] = redis.call('ZCARD', KEYS[2 * i - 1])
+    used[i] = tonumber(redis.call('GET', KEYS[2 * i]) or '0')
+    if rejected == 0 and (counts[i] >= limits[i] or (quotas[i] > 0 and used[i] >= quotas[i])) then
+        rejected = i
+    end
+end
+
+local result = {rejected}
+for i = 1, n do
+    local window_key, quota_key = KEYS[2 * i - 1], KEYS[2 * i]
+    if rejected == 0 then
+        redis.call('ZADD', window_key, now, member)
+        redis.call('PEXPIRE', window_key, windows[i])
+        counts[i] = counts[i] + 1
+        used[i] = redis.call('INCR', quota_key)
+        if used[i] == 1 then
+            redis.call('EXPIRE', quota_key, quota_ttl)
+        end
+    end
+    local remaining = limits[i] - counts[i]
+    local reset = window_reset(window_key, windows[i])
+    if rejected == i and remaining > 0 then
+        -- Rejected on the daily quota, not the window
+        remaining = 0
+        reset = redis.call('TTL', quota_key)
+    end
+    table.insert(result, remaining)
+    table.insert(result, reset)
+    table.insert(result, quotas[i] - used[i])
+end
+return result
+"""
+
+rate_limit_script = redis_client.register_script(RATE_LIMIT_SCRIPT)
+
+
+def _seconds_until_utc_midnight() -> int:
+    now = datetime.now(timezone.utc)
+    midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    return int((midnight - now).total_seconds()) + 1
+
+
+def _identity(api_key) -> str:
+    """Pick the rate limit subject from the decoded token payload."""
+    if isinstance(api_key, dict):
+        return str(api_key.get("id") or api_key.get("sub") or "anonymous")
+    return str(api_key)
+
+
+async def check_rate_limits(endpoints: List[str], identity: str) -> List[Dict[str, int]]:
+    """
+    Count a request against the window and daily quota of each endpoint.
+
+    Returns the state of every endpoint with a configured limit. The request
+    is only counted if all of them allow it; otherwise the first limit that
+    rejected it has allowed=False and no counter is touched. Returns [] if no
+    endpoint is limited or Redis is unavailable (requests are let through).
+    """
+    configs = [(name, settings.RATE_LIMITS[name]) for name in endpoints if settings.RATE_LIMITS.get(name)]
+    if not configs:
+        return []
+
+    day = datetime.now(timezone.utc).strftime("%Y%m%d")
+    keys = []
+    args = [int(time.time() * 1000), _seconds_until_utc_midnight(), uuid.uuid4().hex]
+    for name, config in configs:
+        keys += [f"ratelimit:{name}:{identity}", f"ratelimit:quota:{name}:{identity}:{day}"]
+        args += [config.get("window", 60) * 1000, config["limit"], config.get("quota", 0)]
+
+    try:
+        rejected, *values = await rate_limit_script(keys=keys, args=args)
+    except Exception as e:
+        logger.error("Redis rate limit error: {}", e)
+        return []
+
+    states = []
+    for i, (name, config) in enumerate(configs):
+        remaining, reset, quota_remaining = values[3 * i:3 * i + 3]
+        states.append({
+            "endpoint": name,
+            "allowed": rejected != i + 1,
+            "limit": config["limit"],
+            "window": config.get("window", 60),
+            "remaining": max(0, remaining),
+            "reset": max(0, reset),
+            "quota": config.get("quota", 0),
+            "quota_remaining": max(0, quota_remaining),
+        })
+    return states
+
+
+def rate_limit_headers(state: Dict[str, int]) -> Dict[str, str]:
+    headers = {
+        "RateLimit-Limit": str(state["limit"]),
+        "RateLimit-Remaining": str(state["remaining"]),
+        "RateLimit-Reset": str(state["reset"]),
+        "RateLimit-Policy": f"{state['limit']};w={state['window']}",
+    }
+    if state["quota"]:
+        headers["RateLimit-Policy"] += f", {state['quota']};w=86400"
+    return headers
+
+
+def rate_limit(endpoint: str, trade_endpoint: Optional[str] = None):
+    """
+    Build a dependency enforcing the limits configured for `endpoint`.
+
+    If `trade_endpoint` is given, requests with trade=true are also counted
+    against that (usually much tighter) limit.
+    """
+    async def dependency(request: Request, response: Response, api_key=Depends(get_api_key)):
+        identity = _identity(api_key)
+        endpoints = [endpoint]
+        if trade_endpoint and request.query_params.get("trade", "").lower() in ("1", "true", "yes", "on"):
+            endpoints.append(trade_endpoint)
+
+        states = await check_rate_limits(endpoints, identity)
+        for state in states:
+            headers = rate_limit_headers(state)
+            if not state["allowed"]:
+                logger.warning("Rate limit exceeded for {} on {}", identity, state["endpoint"])
+                headers["Retry-After"] = str(state["reset"])
+                raise HTTPException(
+                    status_code=HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Rate limit exceeded",
+                    headers=headers,
+                )
+            response.headers.update(headers)
+
+    return dependency
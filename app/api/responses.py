@@ -0,0 +1,79 @@
+import hashlib
+from typing import Any, Optional
+
+import orjson
+from bson import ObjectId
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+def _default(obj: Any):
+    # orjson handles dicts, lists, datetimes natively; the rest is ours
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class JSONResponse(ORJSONResponse):
+    """Default response class: orjson, plus ObjectId and model support."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag over `parts` (weak because the body may be re-encoded)."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode())
+        digest.update(b"\0")
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: W/"x" and "x" are the same validator
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+def _with_headers(result: Response, etag: str, response: Optional[Response]) -> Response:
+    if response is not None:
+        result.headers.update(response.headers)
+    result.headers["ETag"] = etag
+    return result
+
+
+def not_modified(etag: str, response: Optional[Response] = None) -> Response:
+    return _with_headers(Response(status_code=304), etag, response)
+
+
+def json_response(request: Request, content: Any, response: Optional[Response] = None,
+                  etag: Optional[str] = None) -> Response:
+    """
+    Render `content` with orjson, skipping FastAPI's jsonable_encoder pass, and
+    answer 304 if the client already has it.
+
+    `etag` defaults to a hash of the body. Headers set on `response` (the
+    dependency sub-response, e.g. rate limit headers) are carried over.
+    """
+    if etag is not None and etag_matches(request, etag):
+        return not_modified(etag, response)
+
+    body = dumps(content)
+    etag = etag or make_etag(body)
+    if etag_matches(request, etag):
+        return not_modified(etag, response)
+
+    return _with_headers(Response(content=body, media_type="application/json"), etag, response)
@@ -1,12 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Request, Response
 from typing import Dict, Any, Optional
 from loguru import logger
 
 from app.api.auth import get_api_key
-from app.cache.redis import get_cache_key, get_cached_data, set_cached_data
-from app.blockchain.subtensor import get_tao_dividends_per_subnet
+from app.api.ratelimit import rate_limit
+from app.api.responses import etag_matches, json_response, make_etag, not_modified
+from app.cache.pubsub import publish_update
+from app.cache.redis import (
+    get_cache_key, get_cached_data, set_cached_data, set_cached_failure, is_cached_failure, is_login_throttled,
+    record_failed_login
+)
+from app.blockchain.subtensor import ChainQueryError, get_tao_dividends_per_subnet
 from app.db.models import TaoDividend, User, get_engine
-from app.tasks import analyze_sentiment_and_stake
+from app.worker import sentiment_pipeline
 
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from pydantic import BaseModel, EmailStr
@@ -18,6 +24,10 @@ from datetime import datetime, timedelta
 from fastapi import FastAPI, HTTPException, Depends, status
 from app.schema.schema import UserCreate, UserResponse, Token, TokenData
 from app.utils.utils import create_access_token, authenticate_user, create_user, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.utils.config import settings
+from app.utils.metrics import timed
+from app.utils.log import sampled_logger
+from app.utils.resilience import CircuitOpenError
 
 router = APIRouter(prefix="/api/v1", tags=["Bittensor API"])
 
@@ -39,15 +49,30 @@ async def register_user(user: UserCreate):
             "is_admin": new_user.is_admin,
             "created_at": new_user.created_at
         }
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error in user registration: {str(e)}")
+        logger.error("Error in user registration: {}", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Registration failed",
+        )
 
 @router.post("/login", response_model=Token)
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
+async def login_for_access_token(request: Request, form_data: OAuth2PasswordRequestForm = Depends()):
+    client_ip = request.client.host if request.client else "unknown"
+    if await is_login_throttled(client_ip):
+        logger.warning("Login throttled for {}", client_ip)
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, try again later",
+            headers={"Retry-After": str(settings.LOGIN_RATE_WINDOW)},
+        )
+
     try:
         user = await authenticate_user(form_data.username, form_data.password)
-        logger.info(f"User authenticated: {user}")
         if not user:
+            await record_failed_login(client_ip)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
@@ -65,41 +90,66 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
             "token_type": "Bearer",
             "expires_at": expires_at
         }
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error in login: {str(e)}")
+        logger.error("Error in login: {}", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Wrong username or password",
         )
 
-@router.get("/tao_dividends")
+@router.get("/tao_dividends", dependencies=[Depends(rate_limit("tao_dividends", "tao_dividends_trade"))])
 async def get_tao_dividends(
-    netuid: Optional[int] = Query(None, description="Subnet ID"),
-    hotkey: Optional[str] = Query(None, description="Hotkey address"),
+    request: Request,
+    response: Response,
+    netuid: int = Query(..., description="Subnet ID"),
+    hotkey: str = Query(..., description="Hotkey address"),
     trade: bool = Query(False, description="Whether to trigger stake/unstake based on sentiment"),
     api_key: str = Depends(get_api_key)
 ):
     """
     Get Tao dividends for a subnet and hotkey.
-    
-    If netuid is omitted, returns data for all netuids.
-    If hotkey is omitted, returns data for all hotkeys on the specified netuid.
+
+    Both are required (422 otherwise): TaoDividendsPerSubnet is read one
+    (netuid, hotkey) entry at a time.
     If trade=True, triggers sentiment analysis and stake/unstake in the background.
+
+    The ETag identifies the cached entry, so polls sending If-None-Match get
+    a 304 until the entry is refreshed.
     """
     try:
         # Check cache first
         engine = await get_engine()
         cache_key = await get_cache_key(netuid, hotkey)
         cached_data = await get_cached_data(cache_key)
+
+        if is_cached_failure(cached_data):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=cached_data["error"],
+                headers={"Retry-After": str(settings.NEGATIVE_CACHE_TTL)},
+            )
         
         if cached_data:
-            logger.info(f"Cache hit for {cache_key}")
+            sampled_logger.debug("Cache hit for {}", cache_key)
             result = cached_data
             result["cached"] = True
         else:
-            logger.info(f"Cache miss for {cache_key}, querying blockchain")
-            logger.info(f"Fetching dividends for netuid={netuid}, hotkey={hotkey}")
-            dividend = await get_tao_dividends_per_subnet(netuid, hotkey)
+            sampled_logger.debug("Cache miss for {}, querying blockchain", cache_key)
+            try:
+                dividend = await get_tao_dividends_per_subnet(netuid, hotkey)
+            except ValueError as e:
+                # The caller's mistake: not cached, and kept off the breakers
+                raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+            except (CircuitOpenError, ChainQueryError):
+                # Cached briefly so an outage doesn't send every request to the chain
+                await set_cached_failure(cache_key, "Chain query failed, try again later")
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Chain query failed, try again later",
+                    headers={"Retry-After": str(settings.NEGATIVE_CACHE_TTL)},
+                )
 
             result = {
                 "netuid": netuid,
@@ -108,33 +158,33 @@ async def get_tao_dividends(
                 "timestamp": str(datetime.now())
             }
 
-            logger.info(f"Dividends fetched: {result}")
-            logger.info(f"Dividends fetched: {result}")
             result["cached"] = False
             
             # Store in cache
             await set_cached_data(cache_key, result)
-            logger.info(f"Stored data in cache with key: {cache_key}")
+            await publish_update("dividend", netuid, hotkey, {
+                "dividend": dividend,
+                "timestamp": result["timestamp"],
+            })
             # Store in database
-            if netuid is not None and hotkey is not None:
-                dividend_record = TaoDividend(
-                    netuid=netuid,
-                    hotkey=hotkey,
-                    dividend=result['dividend']
-                )
+            dividend_record = TaoDividend(
+                netuid=netuid,
+                hotkey=hotkey,
+                dividend=result['dividend']
+            )
+            with timed("engine_save"):
                 await engine.save(dividend_record)
 
-            logger.info(f"Stored dividend record in database: {dividend_record}")
+        etag = make_etag(cache_key, result.get("timestamp"))
+        response.headers["ETag"] = etag
+        if not trade and etag_matches(request, etag):
+            return not_modified(etag, response)
         
         # Handle trade parameter (sentiment analysis and stake/unstake)
         if trade:
-            # Use default values if netuid or hotkey is None
-            stake_netuid = netuid if netuid is not None else 18
-            stake_hotkey = hotkey if hotkey is not None else "5FFApaS75bv5pJHfAp2FVLBj9ZaXuFDjEypsaBNc1wCfe52v"
-            
             # Trigger background task
-            logger.info(f"Triggering sentiment analysis and stake for netuid={stake_netuid}, hotkey={stake_hotkey}")
-            analyze_sentiment_and_stake.delay(stake_netuid, stake_hotkey)
+            logger.info("Triggering sentiment analysis and stake for netuid={}, hotkey={}", netuid, hotkey)
+            sentiment_pipeline(netuid, hotkey).apply_async()
             
             result["stake_tx_triggered"] = True
         else:
@@ -142,12 +192,16 @@ async def get_tao_dividends(
         
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error in tao_dividends endpoint: {str(e)}")
+        logger.error("Error in tao_dividends endpoint: {}", e)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
-@router.get("/operations")
+@router.get("/operations", dependencies=[Depends(rate_limit("operations"))])
 async def get_operations(
+    request: Request,
+    response: Response,
     netuid: Optional[int] = Query(None, description="Filter by subnet ID"),
     hotkey: Optional[str] = Query(None, description="Filter by hotkey address"),
     api_key: str = Depends(get_api_key)
@@ -169,16 +223,18 @@ async def get_operations(
         # Retrieve operations from database
         operations = await engine.find(StakeOperation, query)
         
-        return {
-            "operations": [op.dict() for op in operations]
-        }
+        return json_response(request, {
+            "operations": [op.model_dump() for op in operations]
+        }, response)
         
     except Exception as e:
-        logger.error(f"Error in operations endpoint: {str(e)}")
+        logger.error("Error in operations endpoint: {}", e)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
-@router.get("/sentiment")
+@router.get("/sentiment", dependencies=[Depends(rate_limit("sentiment"))])
 async def get_sentiment(
+    request: Request,
+    response: Response,
     netuid: int = Query(..., description="netuid of the subnet"),
     api_key: str = Depends(get_api_key)
 ):
@@ -190,10 +246,10 @@ async def get_sentiment(
         engine = await get_engine()
         # Retrieve sentiment records from database
         sentiment_records = await engine.find(SentimentAnalysis, SentimentAnalysis.netuid == netuid)
-        logger.info(f"Sentiment records for netuid {netuid}: {sentiment_records}")
+        sampled_logger.debug("Found {} sentiment records for netuid {}", len(sentiment_records), netuid)
         
-        return sentiment_records
+        return json_response(request, [record.model_dump() for record in sentiment_records], response)
         
     except Exception as e:
-        logger.error(f"Error in sentiment endpoint: {str(e)}")
+        logger.error("Error in sentiment endpoint: {}", e)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,138 @@
+import asyncio
+from typing import List, Optional, Set
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from loguru import logger
+
+from app.api.auth import get_api_key
+from app.cache.pubsub import update_channel, update_hub
+from app.utils.config import settings
+from app.utils.metrics import STREAM_SUBSCRIBERS
+
+router = APIRouter(prefix="/api/v1", tags=["Bittensor API"])
+
+
+def parse_subscriptions(values: List[str], include_subnet: bool = True) -> Set[str]:
+    """
+    Turn "netuid" / "netuid:hotkey" strings into channels. A hotkey
+    subscription also receives the subnet-wide updates (sentiment) unless
+    `include_subnet` is False.
+    """
+    if isinstance(values, str):
+        values = [values]
+    channels = set()
+    for value in values:
+        netuid, _, hotkey = value.partition(":")
+        try:
+            netuid = int(netuid)
+        except ValueError:
+            raise ValueError(f"Invalid subscription {value!r}, expected 'netuid' or 'netuid:hotkey'")
+        if include_subnet or not hotkey:
+            channels.add(update_channel(netuid))
+        if hotkey:
+            channels.add(update_channel(netuid, hotkey))
+    if len(channels) > settings.STREAM_MAX_SUBSCRIPTIONS:
+        raise ValueError(f"At most {settings.STREAM_MAX_SUBSCRIPTIONS} subscriptions per connection")
+    return channels
+
+
+def _log_sender_error(task: asyncio.Task):
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error is not None and not isinstance(error, WebSocketDisconnect):
+        logger.error("WebSocket sender failed: {}", error)
+
+
+@router.get("/stream")
+async def stream_updates(
+    request: Request,
+    subscribe: List[str] = Query(..., description="'netuid' or 'netuid:hotkey', repeatable"),
+    api_key: str = Depends(get_api_key)
+):
+    """
+    Server-sent events with dividend reads, sentiment results and stake
+    operations for the subscribed subnets/hotkeys.
+    """
+    try:
+        channels = parse_subscriptions(subscribe)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    queue = update_hub.queue()
+
+    async def events():
+        STREAM_SUBSCRIBERS.labels("sse").inc()
+        try:
+            await update_hub.add(queue, channels)
+            while True:
+                try:
+                    data = await asyncio.wait_for(queue.get(), timeout=settings.STREAM_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ": ping\n\n"
+                    continue
+                yield f"data: {data}\n\n"
+        finally:
+            STREAM_SUBSCRIBERS.labels("sse").dec()
+            await update_hub.remove(queue, channels)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def websocket_updates(websocket: WebSocket, token: Optional[str] = Query(None)):
+    """
+    WebSocket variant of /stream. Browsers cannot set headers on WebSockets,
+    so the token may be passed as ?token=. Clients send
+    {"subscribe": ["18:<hotkey>", ...]} or {"unsubscribe": [...]}.
+    """
+    header = f"Bearer {token}" if token else websocket.headers.get("authorization")
+    try:
+        await get_api_key(header)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    queue = update_hub.queue()
+    channels: Set[str] = set()
+
+    async def forward():
+        while True:
+            await websocket.send_text(await queue.get())
+
+    sender = asyncio.create_task(forward())
+    sender.add_done_callback(_log_sender_error)
+    STREAM_SUBSCRIBERS.labels("websocket").inc()
+    try:
+        while True:
+            message = await websocket.receive_json()
+            try:
+                if "subscribe" in message:
+                    requested = parse_subscriptions(message["subscribe"]) - channels
+                    if len(channels) + len(requested) > settings.STREAM_MAX_SUBSCRIPTIONS:
+                        raise ValueError(f"At most {settings.STREAM_MAX_SUBSCRIPTIONS} subscriptions per connection")
+                    await update_hub.add(queue, requested)
+                    channels |= requested
+                if "unsubscribe" in message:
+                    dropped = parse_subscriptions(message["unsubscribe"], include_subnet=False) & channels
+                    await update_hub.remove(queue, dropped)
+                    channels -= dropped
+            except (ValueError, TypeError) as e:
+                await websocket.send_json({"error": str(e)})
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error("WebSocket stream error: {}", e)
+    finally:
+        sender.cancel()
+        STREAM_SUBSCRIBERS.labels("websocket").dec()
+        await update_hub.remove(queue, channels)
@@ -0,0 +1,273 @@
+"""
+Asyncio-native worker for the Celery queues.
+
+    python -m app.async_worker --queues sentiment.fetch,sentiment.score --concurrency 50
+
+Consumes the same Redis lists, message format (Celery protocol 2) and task
+names as the Celery worker, so producers keep calling send_task/delay
+unchanged. Instead of one synchronous task per process, up to `concurrency`
+task coroutines run at once on a single event loop, which suits the I/O-bound
+sentiment jobs.
+
+Delivery follows kombu's Redis ack emulation: a fetched message is recorded
+in the `unacked` hash until its coroutine finishes, and messages left there
+longer than the visibility timeout (e.g. after a crash) are pushed back onto
+their queue. Failed or timed-out tasks are retried with exponential backoff
+up to ASYNC_WORKER_MAX_RETRIES. Results are written to the Celery Redis result
+backend, so AsyncResult.get() works for either worker type, and chain links
+and callbacks are published on success like Celery does.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import signal
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import List, Tuple
+
+import redis.asyncio as redis
+from loguru import logger
+from opentelemetry import propagate
+
+from app.utils.config import settings
+from app.utils.log import setup_logging
+from app.utils.metrics import CELERY_QUEUE_WAIT, CELERY_TASK_DURATION
+from app.utils.tracing import setup_tracing, tracer
+from app.worker import CELERY_QUEUES, celery_app, redis_url
+
+# kombu Redis transport keys
+UNACKED_KEY = "unacked"
+UNACKED_INDEX_KEY = "unacked_index"
+UNACKED_MUTEX_KEY = "unacked_mutex"
+
+
+def decode_message(raw: str) -> Tuple[dict, str, tuple, dict, dict]:
+    """Return (payload, task_name, args, kwargs, embed) for a protocol 2 message."""
+    payload = json.loads(raw)
+    body = payload["body"]
+    if payload["properties"].get("body_encoding") == "base64":
+        body = base64.b64decode(body)
+    args, kwargs, embed = json.loads(body)
+    return payload, payload["headers"]["task"], tuple(args), kwargs, embed or {}
+
+
+def continue_workflow(embed: dict, result, task_id: str, root_id: str):
+    """
+    Publish what follows a finished task: the next link of its chain (which
+    receives `result` as first argument) and any callbacks. Blocking, so it is
+    run in a thread.
+    """
+    chain = list(embed.get("chain") or [])
+    if chain:
+        # Celery stores the remaining chain reversed: the next task is last
+        next_task = celery_app.signature(chain.pop())
+        next_task.apply_async((result,), chain=chain, parent_id=task_id, root_id=root_id)
+    for callback in embed.get("callbacks") or []:
+        celery_app.signature(callback).apply_async((result,), parent_id=task_id, root_id=root_id)
+
+
+class AsyncWorker:
+    def __init__(self, queues: List[str], concurrency: int):
+        self.queues = queues
+        self.concurrency = concurrency
+        self.client = redis.from_url(redis_url, decode_responses=True)
+        self.slots = asyncio.Semaphore(concurrency)
+        self.running: set = set()
+        self.stopping = asyncio.Event()
+        self.tasks = {}
+
+    async def run(self):
+        from app.tasks import ASYNC_TASKS
+
+        self.tasks = ASYNC_TASKS
+        restorer = asyncio.create_task(self._restore_visible_loop())
+        logger.info(
+            "Async worker consuming {} with concurrency {} ({} tasks registered)",
+            self.queues, self.concurrency, len(self.tasks)
+        )
+
+        while not self.stopping.is_set():
+            await self.slots.acquire()
+            try:
+                item = await self.client.brpop(self.queues, timeout=1)
+            except Exception as e:
+                self.slots.release()
+                logger.error("Broker error: {}", e)
+                await asyncio.sleep(1)
+                continue
+            if item is None:
+                self.slots.release()
+                continue
+
+            queue, raw = item
+            task = asyncio.create_task(self._handle(queue, raw))
+            self.running.add(task)
+            task.add_done_callback(self.running.discard)
+
+        restorer.cancel()
+        if self.running:
+            logger.info("Waiting for {} running tasks", len(self.running))
+            await asyncio.gather(*self.running, return_exceptions=True)
+        await self.client.aclose()
+
+    def stop(self):
+        logger.info("Async worker shutting down")
+        self.stopping.set()
+
+    async def _handle(self, queue: str, raw: str):
+        tag = None
+        try:
+            payload, name, args, kwargs, embed = decode_message(raw)
+            tag = payload["properties"].get("delivery_tag") or uuid.uuid4().hex
+            await self._mark_unacked(tag, payload, queue)
+            sent_at = payload["headers"].get("sent_at")
+            if sent_at and not payload["headers"].get("retries"):
+                CELERY_QUEUE_WAIT.labels(queue).observe(max(0.0, time.time() - sent_at))
+            await self._execute(queue, tag, payload, name, args, kwargs, embed)
+        except Exception as e:
+            logger.error("Could not process message from {}: {}", queue, e)
+            if tag:
+                await self._ack(tag)
+        finally:
+            self.slots.release()
+
+    async def _execute(self, queue: str, tag: str, payload: dict, name: str, args: tuple, kwargs: dict, embed: dict):
+        headers = payload["headers"]
+        task_id = headers["id"]
+        func = self.tasks.get(name)
+        if func is None:
+            logger.error("Received unregistered task {}", name)
+            await self._store_result(task_id, "FAILURE", {"exc_type": "NotRegistered", "exc_message": [name]})
+            await self._ack(tag)
+            return
+
+        started = time.perf_counter()
+        state = "SUCCESS"
+        result = error = None
+        # Continue the producer's trace (context injected by CeleryInstrumentor).
+        # The next link is published inside the span so it joins the same trace.
+        with tracer.start_as_current_span(f"run/{name}", context=propagate.extract(headers)):
+            try:
+                result = await asyncio.wait_for(func(*args, **kwargs), timeout=settings.ASYNC_WORKER_TASK_TIMEOUT)
+            except Exception as e:
+                state = "FAILURE"
+                error = e
+            CELERY_TASK_DURATION.labels(name, state).observe(time.perf_counter() - started)
+
+            if state == "SUCCESS":
+                await self._store_result(task_id, state, result)
+                try:
+                    # to_thread (unlike run_in_executor) carries the trace context over
+                    await asyncio.to_thread(
+                        continue_workflow, embed, result, task_id, headers.get("root_id") or task_id
+                    )
+                except Exception as e:
+                    logger.error("Could not publish the next step after {} [{}]: {}", name, task_id, e)
+                await self._ack(tag)
+                return
+
+        retries = headers.get("retries") or 0
+        if retries < settings.ASYNC_WORKER_MAX_RETRIES:
+            delay = settings.ASYNC_WORKER_RETRY_BACKOFF * (2 ** retries)
+            logger.warning("Task {} [{}] failed ({!r}), retry {} in {}s", name, task_id, error, retries + 1, delay)
+            await self._store_result(task_id, "RETRY", {"exc_type": type(error).__name__, "exc_message": [str(error)]})
+            headers["retries"] = retries + 1
+            # Back off without holding a concurrency slot; the message stays
+            # unacked until it is back on the queue
+            retry = asyncio.create_task(self._requeue_later(delay, tag, payload, queue))
+            self.running.add(retry)
+            retry.add_done_callback(self.running.discard)
+        else:
+            logger.error("Task {} [{}] failed after {} retries: {!r}", name, task_id, retries, error)
+            await self._store_result(task_id, "FAILURE", {"exc_type": type(error).__name__, "exc_message": [str(error)]})
+            await self._ack(tag)
+
+    async def _mark_unacked(self, tag: str, payload: dict, queue: str):
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.zadd(UNACKED_INDEX_KEY, {tag: time.time()})
+            pipe.hset(UNACKED_KEY, tag, json.dumps([payload, "", queue]))
+            await pipe.execute()
+
+    async def _ack(self, tag: str):
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.zrem(UNACKED_INDEX_KEY, tag)
+            pipe.hdel(UNACKED_KEY, tag)
+            await pipe.execute()
+
+    async def _requeue(self, tag: str, payload: dict, queue: str):
+        """Put the message back on its queue and drop the unacked entry atomically."""
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.lpush(queue, json.dumps(payload))
+            pipe.zrem(UNACKED_INDEX_KEY, tag)
+            pipe.hdel(UNACKED_KEY, tag)
+            await pipe.execute()
+
+    async def _requeue_later(self, delay: float, tag: str, payload: dict, queue: str):
+        await asyncio.sleep(delay)
+        await self._requeue(tag, payload, queue)
+
+    async def _restore_visible_loop(self):
+        """Return messages whose consumer died back to their queues."""
+        timeout = settings.ASYNC_WORKER_VISIBILITY_TIMEOUT
+        while True:
+            await asyncio.sleep(min(60, timeout))
+            try:
+                if not await self.client.set(UNACKED_MUTEX_KEY, "1", nx=True, ex=300):
+                    continue
+                try:
+                    stale = await self.client.zrangebyscore(UNACKED_INDEX_KEY, 0, time.time() - timeout)
+                    for tag in stale:
+                        raw = await self.client.hget(UNACKED_KEY, tag)
+                        if raw:
+                            payload, _exchange, queue = json.loads(raw)
+                            payload["headers"]["redelivered"] = True
+                            logger.warning("Restoring unacked message {} to {}", tag, queue)
+                            await self._requeue(tag, payload, queue)
+                        else:
+                            await self.client.zrem(UNACKED_INDEX_KEY, tag)
+                finally:
+                    await self.client.delete(UNACKED_MUTEX_KEY)
+            except Exception as e:
+                logger.error("Error restoring unacked messages: {}", e)
+
+    async def _store_result(self, task_id: str, status: str, result):
+        """Write the task state where Celery's Redis result backend expects it."""
+        key = f"celery-task-meta-{task_id}"
+        meta = json.dumps({
+            "status": status,
+            "result": result,
+            "traceback": None,
+            "children": [],
+            "date_done": datetime.now(timezone.utc).isoformat(),
+            "task_id": task_id,
+        })
+        try:
+            expires = celery_app.conf.result_expires
+            seconds = int(expires.total_seconds()) if hasattr(expires, "total_seconds") else int(expires or 86400)
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.set(key, meta, ex=seconds)
+                pipe.publish(key, meta)
+                await pipe.execute()
+        except Exception as e:
+            logger.error("Could not store result for {}: {}", task_id, e)
+
+
+async def main(queues: List[str], concurrency: int):
+    setup_tracing("bittensor-async-worker")
+    worker = AsyncWorker(queues, concurrency)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    await worker.run()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the asyncio task worker")
+    parser.add_argument("--queues", default=",".join(CELERY_QUEUES), help="Comma-separated queue names")
+    parser.add_argument("--concurrency", type=int, default=settings.ASYNC_WORKER_CONCURRENCY)
+    args = parser.parse_args()
+
+    setup_logging()
+    asyncio.run(main(args.queues.split(","), args.concurrency))
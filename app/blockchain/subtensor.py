@@ -1,11 +1,12 @@
 import os
-from bittensor_wallet import Wallet
 from app.utils.config import settings
+from app.utils.log import sampled_logger
+from app.utils.metrics import timed
+from app.utils.resilience import CircuitBreaker, CircuitOpenError, LatencyWindow, hedged
 from loguru import logger
 import asyncio
-import subprocess
-import os
-import threading
+import re
+import time
 from decimal import Decimal
 
 
@@ -13,33 +14,152 @@ WALLET_NAME = settings.WALLET_NAME
 WALLET_HOTKEY = settings.WALLET_HOTKEY
 WALLET_PATH = os.path.expanduser("~/.bittensor/wallets")
 
+# Shared chain connections, one per network. bittensor is imported lazily
+# rather than at module level because the import alone takes seconds:
+# preload_bittensor() runs it in the gunicorn master before the fork, and
+# init_subtensor() connects (and fetches runtime metadata) once per worker.
+_subtensors = {}
+_subtensor_lock = None
+
+# Breakers for the primary and hedge RPC endpoints, and the btcli subprocess.
+# Query params that fail to encode (ValueError/TypeError) are the caller's
+# mistake, not an endpoint failure, so they never trip the RPC breakers.
+CALLER_ERRORS = (ValueError, TypeError)
+substrate_breaker = CircuitBreaker("substrate", exclude=CALLER_ERRORS)
+hedge_breaker = CircuitBreaker("substrate_hedge", exclude=CALLER_ERRORS)
+btcli_breaker = CircuitBreaker("btcli")
+# Recent primary query latencies; their p95 is the hedging delay
+query_latency = LatencyWindow()
+# Base58 alphabet; SS58 addresses are 46-48 characters long
+SS58_ADDRESS = re.compile(r"[1-9A-HJ-NP-Za-km-z]{46,48}")
+
+
+def preload_bittensor():
+    """Import bittensor so forked workers inherit the loaded module."""
+    started = time.perf_counter()
+    import bittensor  # noqa: F401
+    logger.info("Imported bittensor in {:.2f}s", time.perf_counter() - started)
+
+async def init_subtensor(network: str = None):
+    """Import bittensor and connect the shared AsyncSubtensor for `network`."""
+    global _subtensor_lock
+    network = network or settings.SUBTENSOR_NETWORK
+    if _subtensor_lock is None:
+        _subtensor_lock = asyncio.Lock()
+
+    async with _subtensor_lock:
+        if network not in _subtensors:
+            from bittensor import AsyncSubtensor
+            subtensor = AsyncSubtensor(network=network)
+            await subtensor.initialize()
+            _subtensors[network] = subtensor
+            logger.info("Connected to subtensor network {}", network)
+    return _subtensors[network]
+
+async def get_subtensor(network: str = None):
+    """Return the shared AsyncSubtensor, connecting on first use."""
+    subtensor = _subtensors.get(network or settings.SUBTENSOR_NETWORK)
+    if subtensor is not None:
+        return subtensor
+    return await init_subtensor(network)
+
+async def check_subtensor_connection() -> int:
+    """Return the current block from the primary endpoint (raises on failure)."""
+    subtensor = await get_subtensor()
+    return await subtensor.get_current_block()
+
+async def close_subtensor():
+    for network, subtensor in list(_subtensors.items()):
+        try:
+            await subtensor.close()
+        except Exception as e:
+            logger.error("Error closing subtensor connection to {}: {}", network, e)
+    _subtensors.clear()
+
+
+class ChainQueryError(Exception):
+    """The chain could not be queried: endpoint error, timeout or dropped connection."""
+
+
+def validate_dividend_query(netuid: int, hotkey: str):
+    """Raise ValueError unless `netuid` and `hotkey` can be sent to the chain."""
+    if not isinstance(netuid, int) or isinstance(netuid, bool) or not 0 <= netuid <= 0xFFFF:
+        raise ValueError(f"Invalid netuid {netuid!r}")
+    if not isinstance(hotkey, str) or not SS58_ADDRESS.fullmatch(hotkey):
+        raise ValueError(f"Invalid hotkey {hotkey!r}, expected an SS58 address")
+
+async def _query_dividends(network: str, netuid: int, hotkey: str):
+    subtensor = await get_subtensor(network)
+    result = await subtensor.substrate.query(
+        module='SubtensorModule',
+        storage_function='TaoDividendsPerSubnet',
+        params=[netuid, hotkey]
+    )
+    return result.value
 
+async def _query_primary(netuid: int, hotkey: str):
+    started = time.perf_counter()
+    value = await substrate_breaker.call(_query_dividends, settings.SUBTENSOR_NETWORK, netuid, hotkey)
+    query_latency.observe(time.perf_counter() - started)
+    return value
+
+@timed("get_tao_dividends_per_subnet")
 async def get_tao_dividends_per_subnet(netuid: int, hotkey: str):
+    """
+    Query TaoDividendsPerSubnet. Raises ValueError for a malformed netuid or
+    hotkey (before anything is sent), CircuitOpenError while the endpoint's
+    circuit is open, and ChainQueryError if the query itself fails.
+
+    With SUBTENSOR_HEDGE_NETWORK set, a second query goes to that endpoint
+    when the primary is slower than its recent p95 (or fails), and the first
+    answer wins.
+    """
+    validate_dividend_query(netuid, hotkey)
     try:
-        from bittensor import AsyncSubtensor
-        subtensor = AsyncSubtensor()
-        substrate = subtensor.substrate
-
-        result = await substrate.query(
-            module='SubtensorModule',
-            storage_function='TaoDividendsPerSubnet',
-            params=[netuid, hotkey]
-        )
-        logger.info(f"TaoDividendsPerSubnet(netuid={netuid}, hotkey={hotkey}) = {result.value}")
-        return result.value
+        if settings.SUBTENSOR_HEDGE_NETWORK:
+            value = await hedged(
+                lambda: _query_primary(netuid, hotkey),
+                lambda: hedge_breaker.call(_query_dividends, settings.SUBTENSOR_HEDGE_NETWORK, netuid, hotkey),
+                delay=query_latency.percentile(95, default=settings.SUBTENSOR_HEDGE_DELAY),
+            )
+        else:
+            value = await _query_primary(netuid, hotkey)
+        logger.debug("TaoDividendsPerSubnet(netuid={}, hotkey={}) = {}", netuid, hotkey, value)
+        return value
 
+    except CircuitOpenError as e:
+        # Once per request during an outage; the breaker logs the state change
+        sampled_logger.info("Skipping TaoDividendsPerSubnet query: {}", e)
+        raise
+    except CALLER_ERRORS as e:
+        # Passed validation but still rejected by the encoder
+        raise ValueError(f"Invalid TaoDividendsPerSubnet params: {e}") from e
     except Exception as e:
-        logger.error(f"Error querying TaoDividendsPerSubnet: {e}")
-        return None
+        logger.error("Error querying TaoDividendsPerSubnet: {}", e)
+        raise ChainQueryError(str(e)) from e
+
+async def _run_btcli(cmd: str, wallet_password: str):
+    """Run a btcli command, feeding the password on stdin. Raises on timeout."""
+    # Non-blocking, so other tasks on the loop keep running meanwhile.
+    process = await asyncio.create_subprocess_exec(
+        *cmd.split(),
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
 
-def input_password(password, process):
-    """Function to input password to subprocess when prompted"""
     try:
-        process.stdin.write(password + "\n")
-        process.stdin.flush()
-    except Exception as e:
-        logger.error(f"Error inputting password: {e}")
+        stdout, stderr = await asyncio.wait_for(
+            process.communicate(input=(wallet_password + "\n").encode()),
+            timeout=60
+        )
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise
+    return process, stdout.decode(), stderr.decode()
 
+@timed("perform_sentiment_based_staking")
 async def perform_sentiment_based_staking(sentiment_score, wallet_password="Test@123#"):
     """
     Perform staking based on sentiment analysis with automated password entry.
@@ -50,7 +170,6 @@ async def perform_sentiment_based_staking(sentiment_score, wallet_password="Test
         wallet_password: Password for the wallet
     """
     try:
-        import bittensor as bt
         # Calculate stake amount based on sentiment
         amount = abs(sentiment_score) * Decimal('0.01')
         
@@ -64,29 +183,16 @@ async def perform_sentiment_based_staking(sentiment_score, wallet_password="Test
         else:
             cmd = f"btcli stake remove --wallet.name {WALLET_NAME} --wallet.hotkey default --amount {amount} --netuid {netuid} --hotkey {hotkey_ss58}"
         
-        # Execute the command as a subprocess with password input
-        process = subprocess.Popen(
-            cmd.split(),
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
-        )
-        
-        # Start a thread to input the password when prompted
-        input_thread = threading.Thread(target=input_password, args=(wallet_password, process))
-        input_thread.start()
-        
-        # Get the output
-        stdout, stderr = process.communicate(timeout=60)
-        
+        # Execute the command as a subprocess; fails fast while btcli keeps timing out
+        process, stdout, stderr = await btcli_breaker.call(_run_btcli, cmd, wallet_password)
+
         if process.returncode != 0:
-            logger.error(f"Error: {stderr}")
+            logger.error("Error: {}", stderr)
             return False, stderr
         else:
-            logger.info(f"Success: {stdout}")
+            logger.info("Success: {}", stdout)
             return True, stdout
         
     except Exception as e:
-        logger.error(f"Error in sentiment-based staking: {e}")
+        logger.error("Error in sentiment-based staking: {}", e)
         return False, str(e)
@@ -0,0 +1,123 @@
+import asyncio
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Optional, Set
+
+import orjson
+from loguru import logger
+
+from app.cache.redis import redis_client
+from app.utils.config import settings
+from app.utils.metrics import STREAM_DROPPED
+
+
+def update_channel(netuid: int, hotkey: Optional[str] = None) -> str:
+    """Pub/sub channel for updates about a subnet, or one hotkey on it."""
+    return f"updates:{netuid}:{hotkey or 'all'}"
+
+
+async def publish_update(event: str, netuid: int, hotkey: Optional[str] = None, data: Any = None):
+    """
+    Publish an update for stream subscribers. Never raises: a lost update
+    only means a client sees the change on its next poll.
+    """
+    message = orjson.dumps(
+        {"event": event, "netuid": netuid, "hotkey": hotkey, "data": data},
+        default=str,
+    )
+    try:
+        await redis_client.publish(update_channel(netuid, hotkey), message)
+    except Exception as e:
+        logger.error("Failed to publish {} update for netuid {}: {}", event, netuid, e)
+
+
+class UpdateHub:
+    """
+    Per-process fan-out of update channels to local subscribers.
+
+    All subscribers in the process share one Redis pub/sub connection: a
+    channel is subscribed in Redis while at least one local queue wants it,
+    and a single reader task copies each message into those queues. A queue
+    that is full loses its oldest message, so a slow client never holds up
+    the others.
+    """
+
+    def __init__(self, client=redis_client):
+        self.client = client
+        self.pubsub = None
+        self.reader: Optional[asyncio.Task] = None
+        self.queues: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self.lock = asyncio.Lock()
+
+    def queue(self) -> asyncio.Queue:
+        return asyncio.Queue(maxsize=settings.STREAM_QUEUE_SIZE)
+
+    async def add(self, queue: asyncio.Queue, channels: Iterable[str]):
+        async with self.lock:
+            new = []
+            for channel in channels:
+                if not self.queues[channel]:
+                    new.append(channel)
+                self.queues[channel].add(queue)
+            if new:
+                if self.pubsub is None:
+                    self.pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                await self.pubsub.subscribe(*new)
+            if self.reader is None:
+                self.reader = asyncio.create_task(self._read_loop())
+
+    async def remove(self, queue: asyncio.Queue, channels: Iterable[str]):
+        async with self.lock:
+            unused = []
+            for channel in channels:
+                subscribers = self.queues.get(channel)
+                if subscribers is None:
+                    continue
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self.queues[channel]
+                    unused.append(channel)
+            if unused and self.pubsub is not None:
+                try:
+                    await self.pubsub.unsubscribe(*unused)
+                except Exception as e:
+                    logger.error("Failed to unsubscribe from {}: {}", unused, e)
+
+    async def _read_loop(self):
+        while True:
+            try:
+                if not self.pubsub.subscribed:
+                    await asyncio.sleep(0.5)
+                    continue
+                message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # redis-py reconnects and re-subscribes on the next call
+                logger.error("Update stream read error: {}", e)
+                await asyncio.sleep(1)
+                continue
+            if message is None or message["type"] != "message":
+                continue
+
+            data = message["data"]
+            for queue in tuple(self.queues.get(message["channel"], ())):
+                if queue.full():
+                    queue.get_nowait()
+                    STREAM_DROPPED.inc()
+                queue.put_nowait(data)
+
+    async def close(self):
+        if self.reader is not None:
+            self.reader.cancel()
+            try:
+                await self.reader
+            except asyncio.CancelledError:
+                pass
+            self.reader = None
+        if self.pubsub is not None:
+            await self.pubsub.aclose()
+            self.pubsub = None
+        self.queues.clear()
+
+
+update_hub = UpdateHub()
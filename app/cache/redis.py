@@ -3,6 +3,8 @@ import json
 from typing import Any, Optional
 import redis.asyncio as redis
 from loguru import logger
+from app.utils.config import settings
+from app.utils.metrics import CACHE_REQUESTS, timed
 
 # Initialize Redis connection
 redis_host = os.getenv("REDIS_HOST", "redis")
@@ -21,30 +23,82 @@ async def get_cache_key(netuid: Optional[int] = None, hotkey: Optional[str] = No
     else:
         return f"dividend:all"
 
+def encode_cache_value(data: Any) -> str:
+    """Serialize a value for storage in the cache."""
+    return json.dumps(data)
+
+def decode_cache_value(raw: str) -> Any:
+    """Deserialize a value read from the cache."""
+    return json.loads(raw)
+
+@timed("cache_get")
 async def get_cached_data(key: str) -> Optional[dict]:
     """Retrieve data from Redis cache."""
     try:
         data = await redis_client.get(key)
         if data:
-            return json.loads(data)
+            value = decode_cache_value(data)
+            # Remembered failures are not served data; keep them out of the hit ratio
+            CACHE_REQUESTS.labels("negative" if is_cached_failure(value) else "hit").inc()
+            return value
+        CACHE_REQUESTS.labels("miss").inc()
         return None
     except Exception as e:
-        logger.error(f"Redis cache error: {str(e)}")
+        logger.error("Redis cache error: {}", e)
         return None
 
-async def set_cached_data(key: str, data: Any) -> bool:
+@timed("cache_set")
+async def set_cached_data(key: str, data: Any, ttl: int = CACHE_TTL) -> bool:
     """Store data in Redis cache with TTL."""
     try:
-        await redis_client.set(key, json.dumps(data), ex=CACHE_TTL)
+        await redis_client.set(key, encode_cache_value(data), ex=ttl)
         return True
     except Exception as e:
-        logger.error(f"Redis cache error: {str(e)}")
+        logger.error("Redis cache error: {}", e)
+        return False
+
+async def set_cached_failure(key: str, error: str) -> bool:
+    """
+    Remember a failed lookup for NEGATIVE_CACHE_TTL seconds, so requests
+    during an outage don't all go to the failing dependency. Read back
+    through get_cached_data; check is_cached_failure() on the result.
+    """
+    return await set_cached_data(key, {"unavailable": True, "error": error}, ttl=settings.NEGATIVE_CACHE_TTL)
+
+def is_cached_failure(data: Optional[dict]) -> bool:
+    return isinstance(data, dict) and data.get("unavailable") is True
+
+def _login_key(client_ip: str) -> str:
+    return f"login_failures:{client_ip}"
+
+async def is_login_throttled(client_ip: str) -> bool:
+    """
+    Whether the client IP has had LOGIN_RATE_LIMIT failed logins within the
+    window. The IP is request.client.host, so behind a proxy that is not in
+    FORWARDED_ALLOW_IPS all clients share the proxy's address and one bucket.
+    """
+    try:
+        failures = await redis_client.get(_login_key(client_ip))
+        return int(failures or 0) >= settings.LOGIN_RATE_LIMIT
+    except Exception as e:
+        logger.error("Redis login throttle error: {}", e)
         return False
 
+async def record_failed_login(client_ip: str) -> None:
+    """Count a failed login for the client IP; the window starts at the first failure."""
+    key = _login_key(client_ip)
+    try:
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.incr(key)
+            pipe.expire(key, settings.LOGIN_RATE_WINDOW, nx=True)
+            await pipe.execute()
+    except Exception as e:
+        logger.error("Redis login throttle error: {}", e)
+
 async def check_redis_connection() -> bool:
     """Check if Redis connection is working."""
     try:
         return await redis_client.ping()
     except Exception as e:
-        logger.error(f"Redis connection error: {str(e)}")
+        logger.error("Redis connection error: {}", e)
         return False
\ No newline at end of file
@@ -1,6 +1,6 @@
 import os
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from motor.motor_asyncio import AsyncIOMotorClient
 from odmantic import AIOEngine, Model, Field
 from loguru import logger
@@ -36,6 +36,15 @@ class StakeOperation(Model):
     successful: bool = False
     error_message: Optional[str] = None
 
+class AnalyticsResult(Model):
+    """Output of an offline analytics run (app.analytics)"""
+    kind: str  # "sentiment_dividend_correlation" or "backtest"
+    params: Dict[str, Any]
+    results: Dict[str, Any]
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    model_config = {"collection": "analytics_results"}
+
 class User(Model):
     """Model for user authentication"""
     email: str = Field(unique=True)
@@ -54,26 +63,45 @@ async def init_db():
     client = AsyncIOMotorClient(mongodb_url)
     # Fixed parameter name from motor_client to client
     engine = AIOEngine(client=client, database=mongodb_db)
-    logger.info(f"Connected to MongoDB at {mongodb_url}")
-    logger.info(f"Using engine: {engine}")
     
     # Verify connection
     try:
         await client.admin.command('ping')
-        print(f"Connected to MongoDB at {mongodb_url}")
+        logger.info("Connected to MongoDB at {}", mongodb_url)
+    except Exception as e:
+        logger.error("Failed to connect to MongoDB: {}", e)
+
+    # Create the unique indexes declared on the models (email, username)
+    try:
+        await engine.configure_database([User])
     except Exception as e:
-        print(f"Failed to connect to MongoDB: {str(e)}")
+        logger.error("Failed to create MongoDB indexes: {}", e)
 
     return engine
 
+async def ensure_db():
+    """Return the engine, connecting once per process on first use (workers)"""
+    if engine is None:
+        return await init_db()
+    return engine
+
 async def get_engine():
     """Dependency to get the database engine"""
     if engine is None:
         raise RuntimeError("Database engine is not initialized. Call init_db() first.")
     return engine
 
+async def check_db_connection() -> bool:
+    """Ping MongoDB. Raises if the client is missing or the ping fails."""
+    if client is None:
+        raise RuntimeError("Database client is not initialized")
+    await client.admin.command('ping')
+    return True
+
 async def close_db():
     """Close database connection"""
-    global client
+    global client, engine
     if client:
-        client.close()
\ No newline at end of file
+        client.close()
+    client = None
+    engine = None
\ No newline at end of file
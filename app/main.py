@@ -1,5 +1,8 @@
 import os
-from fastapi import FastAPI, Depends
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, Response
+from loguru import logger
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
@@ -8,13 +11,61 @@ load_dotenv()
 
 # # Import app modules
 from app.api.routes import router as api_router
+from app.api.stream import router as stream_router
+from app.api.responses import JSONResponse
 from app.db.models import init_db, close_db
+from app.utils.utils import hash_executor
+from app.utils.config import settings
+from app.utils.compression import CompressionMiddleware
+from app.utils.metrics import PrometheusMiddleware, render_metrics, update_queue_depth
+from app.cache.redis import redis_client, check_redis_connection
+from app.cache.pubsub import update_hub
+from app.utils.log import setup_logging
+from app.utils.tracing import instrument_app, setup_tracing, shutdown_tracing
+from app.blockchain.subtensor import init_subtensor, close_subtensor
+from app.utils.health import readiness
+from app.utils.resilience import breaker_states
+from app.worker import CELERY_QUEUES
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    # Runs once per server worker, so every process owns its own pools
+    setup_logging()
+    setup_tracing("bittensor-api")
+    await init_db()
+    if not await check_redis_connection():
+        logger.warning("Redis is not reachable at startup")
+
+    if settings.PRELOAD_SUBTENSOR:
+        # Connect and fetch metadata here, not on a request. bittensor itself
+        # is already imported if the server preloaded it before forking.
+        try:
+            await init_subtensor()
+            if settings.SUBTENSOR_HEDGE_NETWORK:
+                await init_subtensor(settings.SUBTENSOR_HEDGE_NETWORK)
+        except Exception as e:
+            logger.error("Subtensor preload failed, will retry on first use: {}", e)
+
+    logger.info("Startup completed in {:.2f}s", time.perf_counter() - started)
+    yield
+
+    await update_hub.close()
+    await close_subtensor()
+    await close_db()
+    await redis_client.aclose()
+    hash_executor.shutdown(wait=False)
+    shutdown_tracing()
+
 
 # Create FastAPI app
 app = FastAPI(
     title="Bittensor API Service",
     description="Asynchronous API for querying Tao dividends and managing stake operations",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=JSONResponse,
 )
 
 # Configure CORS
@@ -26,24 +77,48 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.GZIP_LEVEL,
+    brotli_quality=settings.BROTLI_QUALITY,
+)
+app.add_middleware(PrometheusMiddleware)
+instrument_app(app)
+
 # Add API routes
 app.include_router(api_router)
-
-@app.on_event("startup")
-async def startup_db_client():
-    await init_db()
-
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    await close_db()
+app.include_router(stream_router)
 
 @app.get("/", tags=["Root"])
 async def root():
     return {"message": "Welcome to Bittensor API Service"}
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    await update_queue_depth(redis_client, CELERY_QUEUES)
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+@app.get("/health/live", tags=["Health"])
+async def liveness():
+    """The process is up and its event loop is responsive. Checks no dependency."""
+    return {"status": "alive"}
+
+@app.get("/health/ready", tags=["Health"])
+async def readiness_check():
+    """
+    Whether this replica should receive traffic: Redis, MongoDB and the chain
+    must be reachable. Results are cached for HEALTH_CACHE_TTL seconds.
+    """
+    report = await readiness()
+    return JSONResponse(report, status_code=200 if report["status"] == "ready" else 503)
+
 @app.get("/health", tags=["Health"])
 async def health_check():
-    return {"status": "healthy"}
+    breakers = breaker_states()
+    degraded = any(breaker["state"] != "closed" for breaker in breakers.values())
+    return {"status": "degraded" if degraded else "healthy", "breakers": breakers}
 
 if __name__ == "__main__":
     import uvicorn
@@ -4,6 +4,8 @@ import re
 from typing import List, Dict, Any
 from loguru import logger
 from app.utils.config import settings
+from app.utils.metrics import timed
+from app.utils.resilience import CircuitBreaker, CircuitOpenError
 import json
 
 from app.utils.config import settings
@@ -16,6 +18,9 @@ WALLET_HOTKEY=settings.WALLET_HOTKEY
 CHUTES_API_KEY = settings.CHUTES_API_KEY
 CHUTES_API_URL = settings.CHUTES_API_URL
 
+# Fail fast instead of waiting out the 60s timeout while Chutes is down
+chutes_breaker = CircuitBreaker("chutes")
+
 
 
 def extract_sentiment_score(response: dict) -> int:
@@ -47,12 +52,20 @@ def extract_sentiment_score(response: dict) -> int:
             return max(-100, min(100, score))  # Clamp to range
         
     except Exception as e:
-        print(f"Error extracting sentiment score: {e}")
+        logger.error("Error extracting sentiment score: {}", e)
 
     # Fallback neutral
     return 0
 
 
+async def _post_completion(url: str, headers: dict, payload: dict) -> dict:
+    async with httpx.AsyncClient() as client:
+        response = await client.post(url, headers=headers, json=payload, timeout=60.0)
+        response.raise_for_status()
+        return response.json()
+
+
+@timed("analyze_sentiment")
 async def analyze_sentiment(tweets: List[Dict[str, Any]]) -> int:
     """
     Analyze sentiment of tweets using Chutes.ai LLM.
@@ -105,21 +118,20 @@ async def analyze_sentiment(tweets: List[Dict[str, Any]]) -> int:
     }
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, headers=headers, json=payload, timeout=60.0)
-            response.raise_for_status()
+        data = await chutes_breaker.call(_post_completion, url, headers, payload)
 
-            data = response.json()
-
-            logger.debug(f"Chutes API response: {data}")
-            return extract_sentiment_score(data)
+        logger.debug("Chutes API response: {}", data)
+        return extract_sentiment_score(data)
 
+    except CircuitOpenError as e:
+        logger.warning("Chutes API unavailable: {}", e)
+        raise
     except httpx.HTTPStatusError as e:
-        logger.error(f"Chutes API HTTP error: {e.response.status_code} - {e.response.text}")
+        logger.error("Chutes API HTTP error: {} - {}", e.response.status_code, e.response.text)
         raise
     except httpx.RequestError as e:
-        logger.error(f"Chutes API request error: {str(e)}")
+        logger.error("Chutes API request error: {}", e)
         raise
     except Exception as e:
-        logger.error(f"Error analyzing sentiment: {str(e)}")
+        logger.error("Error analyzing sentiment: {}", e)
         raise
\ No newline at end of file
@@ -3,12 +3,24 @@ import httpx
 from typing import List, Dict, Any
 from loguru import logger
 from app.utils.config import settings
+from app.utils.metrics import timed
+from app.utils.resilience import CircuitBreaker, CircuitOpenError
 
 # Datura.ai API configuration
 DATURA_API_KEY = settings.DATURA_API_KEY
 DATURA_API_URL = settings.DATURA_API_URL
 
+datura_breaker = CircuitBreaker("datura")
 
+
+async def _get_tweets(url: str, headers: dict, params: dict):
+    async with httpx.AsyncClient() as client:
+        response = await client.get(url, headers=headers, params=params, timeout=30.0)
+        response.raise_for_status()
+        return response.json()
+
+
+@timed("search_twitter")
 async def search_twitter(netuid: int, count: int = 10) -> List[Dict[str, Any]]:
     """
     Search recent tweets for the specified Bittensor subnet using Datura.ai.
@@ -25,7 +37,7 @@ async def search_twitter(netuid: int, count: int = 10) -> List[Dict[str, Any]]:
         raise ValueError("Datura API key not configured")
 
     search_term = f"Bittensor netuid {netuid}"
-    logger.info(f"Searching tweets for: {search_term}")
+    logger.debug("Searching tweets for: {}", search_term)
 
     url = f"{DATURA_API_URL}/twitter"
     headers = {
@@ -50,24 +62,24 @@ async def search_twitter(netuid: int, count: int = 10) -> List[Dict[str, Any]]:
     }
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers, params=params, timeout=30.0)
-            response.raise_for_status()
-            data = response.json()
+        data = await datura_breaker.call(_get_tweets, url, headers, params)
 
-            if not data:
-                logger.warning(f"No tweets found for netuid {netuid}")
-                return []
+        if not data:
+            logger.warning("No tweets found for netuid {}", netuid)
+            return []
 
-            logger.info(f"Fetched tweets for netuid={netuid}")
-            return data
+        logger.debug("Fetched {} tweets for netuid={}", len(data), netuid)
+        return data
 
+    except CircuitOpenError as e:
+        logger.warning("Datura API unavailable: {}", e)
+        raise
     except httpx.HTTPStatusError as e:
-        logger.error(f"Datura API HTTP error: {e.response.status_code} - {e.response.text}")
+        logger.error("Datura API HTTP error: {} - {}", e.response.status_code, e.response.text)
         raise
     except httpx.RequestError as e:
-        logger.error(f"Datura API request error: {str(e)}")
+        logger.error("Datura API request error: {}", e)
         raise
     except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}")
+        logger.error("Unexpected error: {}", e)
         raise
\ No newline at end of file
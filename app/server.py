@@ -0,0 +1,90 @@
+"""
+Production entry point: gunicorn managing uvicorn workers.
+
+    python -m app.server
+
+The app, and with PRELOAD_SUBTENSOR the bittensor package, is imported once in
+the master (preload) and forked into WEB_CONCURRENCY workers. Connections are
+never opened before the fork: each worker creates its own Mongo, Redis and
+subtensor clients in the lifespan handler of app.main.
+
+Signals (sent to the master):
+    HUP   restart workers one by one with the current code. With PRELOAD_APP
+          the code is not re-read; use USR2 + QUIT for a full code reload.
+    TERM  graceful shutdown. Workers stop accepting, finish in-flight requests
+          for up to GRACEFUL_TIMEOUT seconds, then run lifespan shutdown.
+"""
+import os
+import shutil
+
+from app.utils.config import settings
+
+# Must be set before prometheus_client is first imported (via app.main)
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", settings.PROMETHEUS_MULTIPROC_DIR)
+
+from gunicorn.app.base import BaseApplication
+from loguru import logger
+
+from app.utils.log import setup_logging
+
+
+def post_fork(server, worker):
+    logger.info("Worker {} started", worker.pid)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
+
+class Server(BaseApplication):
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from app.main import app
+        if settings.PRELOAD_SUBTENSOR:
+            # Only the import: the chain connection is opened per worker
+            from app.blockchain.subtensor import preload_bittensor
+            preload_bittensor()
+        return app
+
+
+def gunicorn_options() -> dict:
+    return {
+        "bind": f"{settings.SERVER_HOST}:{settings.SERVER_PORT}",
+        "workers": settings.WEB_CONCURRENCY,
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": settings.PRELOAD_APP,
+        "timeout": settings.WORKER_TIMEOUT,
+        "graceful_timeout": settings.GRACEFUL_TIMEOUT,
+        "keepalive": settings.KEEPALIVE,
+        # Recycle workers gradually so leaks never force a full restart
+        "max_requests": settings.MAX_REQUESTS,
+        "max_requests_jitter": settings.MAX_REQUESTS_JITTER,
+        "forwarded_allow_ips": settings.FORWARDED_ALLOW_IPS,
+        "accesslog": None,
+        "post_fork": post_fork,
+        "child_exit": child_exit,
+    }
+
+
+def run():
+    # Master process; workers inherit it (the lifespan call is then a no-op)
+    setup_logging()
+    # Stale metric files from a previous run would be summed into /metrics.
+    # Cleared before the app is preloaded so nothing has been written yet.
+    multiproc_dir = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(multiproc_dir, ignore_errors=True)
+    os.makedirs(multiproc_dir, exist_ok=True)
+
+    Server(gunicorn_options()).run()
+
+
+if __name__ == "__main__":
+    run()
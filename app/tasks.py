@@ -3,82 +3,119 @@ import asyncio
 from typing import Dict, List, Any, Optional
 from loguru import logger
 
-from app.worker import celery_app
+from app.worker import celery_app, sentiment_pipeline
 from app.sentiment.datura import search_twitter
 from app.sentiment.chutes import analyze_sentiment
-from app.db.models import  SentimentAnalysis, StakeOperation, init_db
+from app.db.models import  SentimentAnalysis, StakeOperation, ensure_db
 from app.blockchain.subtensor import perform_sentiment_based_staking
+from app.cache.pubsub import publish_update
+from app.utils.metrics import timed
+
+# Tweets are trimmed before being handed to the scoring stage to keep the
+# message passed between queues small
+MAX_TWEET_CHARS = 500
+
+
+def _run(coro):
+    """Run a coroutine on the worker process's event loop."""
+    loop = asyncio.get_event_loop()
+    return loop.run_until_complete(coro)
 
 @celery_app.task(name="app.tasks.analyze_sentiment_and_stake")
 def analyze_sentiment_and_stake(netuid: int, hotkey: str):
     """
-    Celery task to analyze Twitter sentiment and stake/unstake based on results.
-    
-    This is a synchronous wrapper around async functions.
+    Entry point kept for existing producers: starts the staged
+    fetch -> score -> stake pipeline and returns its id.
     
     Args:
         netuid: Subnet ID
         hotkey: Hotkey address
     """
-    logger.info(f"Starting sentiment analysis and stake task for netuid={netuid}, hotkey={hotkey}")
-    print(f"Starting sentiment analysis and stake task for netuid={netuid}, hotkey={hotkey}")
-    loop = asyncio.get_event_loop()
-    return loop.run_until_complete(_analyze_sentiment_and_stake(netuid, hotkey))
+    logger.info("Starting sentiment analysis and stake pipeline for netuid={}, hotkey={}", netuid, hotkey)
+    return sentiment_pipeline(netuid, hotkey).apply_async().id
 
-async def _analyze_sentiment_and_stake(netuid: int, hotkey: str):
+@celery_app.task(name="app.tasks.fetch_tweets")
+def fetch_tweets(netuid: int):
+    return _run(_fetch_tweets(netuid))
+
+@celery_app.task(name="app.tasks.score_sentiment")
+def score_sentiment(texts: List[str], netuid: int):
+    return _run(_score_sentiment(texts, netuid))
+
+@celery_app.task(name="app.tasks.stake_on_sentiment")
+def stake_on_sentiment(scored: Optional[Dict[str, Any]], netuid: int, hotkey: str):
+    return _run(_stake_on_sentiment(scored, netuid, hotkey))
+
+async def _fetch_tweets(netuid: int) -> List[str]:
+    """
+    Search recent tweets about the subnet.
+
+    Returns:
+        Tweet texts, trimmed to MAX_TWEET_CHARS
+    """
+    tweets = await search_twitter(netuid=netuid)
+    logger.debug("Found {} tweets for subnet {}", len(tweets), netuid)
+    return [str(tweet.get("text", ""))[:MAX_TWEET_CHARS] for tweet in tweets]
+
+async def _score_sentiment(texts: List[str], netuid: int) -> Optional[Dict[str, Any]]:
+    """
+    Score tweet texts with the LLM and store the result.
+
+    Returns:
+        {"sentiment_score", "tweet_count"}, or None if there was nothing to score
+    """
+    if not texts:
+        logger.warning("No tweets found for subnet {}, skipping sentiment analysis", netuid)
+        return None
+
+    engine = await ensure_db()
+    sentiment_score = await analyze_sentiment([{"text": text} for text in texts])
+
+    # Save sentiment analysis to database
+    sentiment_record = SentimentAnalysis(
+        netuid=netuid,
+        sentiment_score=sentiment_score,
+        tweet_count=len(texts),
+        search_term=f"Bittensor netuid {netuid}"
+    )
+    with timed("engine_save"):
+        await engine.save(sentiment_record)
+    await publish_update("sentiment", netuid, data={
+        "sentiment_score": sentiment_score,
+        "tweet_count": len(texts),
+        "timestamp": sentiment_record.timestamp,
+    })
+
+    logger.info("Sentiment score for netuid {}: {}", netuid, sentiment_score)
+    return {"sentiment_score": sentiment_score, "tweet_count": len(texts)}
+
+async def _stake_on_sentiment(scored: Optional[Dict[str, Any]], netuid: int, hotkey: str):
     """
-    Async implementation of sentiment analysis and staking/unstaking.
+    Stake/unstake based on a sentiment score and record the operation.
     
     Args:
+        scored: Output of the scoring stage
         netuid: Subnet ID
         hotkey: Hotkey address
         
     Returns:
         Operation result
     """
-    try:
-        # Search for tweets about the subnet
-        await init_db()
-        from app.db.models import  get_engine
-        engine = await get_engine()
-
-        tweets = await search_twitter(netuid=netuid)
+    if not scored:
+        return {
+            "success": False,
+            "error": "No tweets found for analysis"
+        }
 
-        print(f"Found {len(tweets)} tweets for subnet {netuid}")
-        
-        if not tweets:
-            logger.warning(f"No tweets found for subnet {netuid}, skipping sentiment analysis")
-            return {
-                "success": False,
-                "error": "No tweets found for analysis"
-            }
-        
-        # Analyze sentiment
-        sentiment_score = await analyze_sentiment(tweets)
-        
-        # Save sentiment analysis to database
-        sentiment_record = SentimentAnalysis(
-            netuid=netuid,
-            sentiment_score=sentiment_score,
-            tweet_count=len(tweets),
-            search_term=f"Bittensor netuid {netuid}"
-        )
-        await engine.save(sentiment_record)
+    try:
+        engine = await ensure_db()
+        sentiment_score = scored["sentiment_score"]
 
-        logger.info(f"Sentiment score for netuid {netuid}: {sentiment_score}")
-        
         # Calculate stake amount (0.01 tao * sentiment score)
         stake_amount = abs(sentiment_score) * 0.01
-        
-        # Initialize blockchain client
-        # result = await stake_based_on_sentiment(netuid, hotkey, sentiment_score)
         result = await perform_sentiment_based_staking(sentiment_score)
-        
-        logger.info(f"Stake operation result: {result}")
+        logger.info("Stake operation result: {}", result)
 
-        # Perform stake/unstake operation based on sentiment
-        
-        
         # Save operation to database
         op_type = "stake" if sentiment_score > 0 else "unstake"
         stake_op = StakeOperation(
@@ -91,7 +128,9 @@ async def _analyze_sentiment_and_stake(netuid: int, hotkey: str):
             transaction_hash="transaction_hash",
             error_message=result[1]
         )
-        await engine.save(stake_op)
+        with timed("engine_save"):
+            await engine.save(stake_op)
+        await publish_update("stake", netuid, hotkey, stake_op.model_dump(exclude={"id"}))
         
         return {
             "success": True,
@@ -102,8 +141,23 @@ async def _analyze_sentiment_and_stake(netuid: int, hotkey: str):
         }
         
     except Exception as e:
-        logger.error(f"Error in sentiment analysis and stake task: {str(e)}")
+        logger.error("Error in stake task: {}", e)
         return {
             "success": False,
             "error": str(e)
-        }
\ No newline at end of file
+        }
+
+async def _analyze_sentiment_and_stake(netuid: int, hotkey: str):
+    """Start the pipeline from the async worker (publishing is blocking I/O)."""
+    # to_thread copies contextvars, so the pipeline joins the current trace
+    result = await asyncio.to_thread(sentiment_pipeline(netuid, hotkey).apply_async)
+    return result.id
+
+
+# Coroutines behind the Celery tasks, by task name, for app.async_worker
+ASYNC_TASKS = {
+    "app.tasks.analyze_sentiment_and_stake": _analyze_sentiment_and_stake,
+    "app.tasks.fetch_tweets": _fetch_tweets,
+    "app.tasks.score_sentiment": _score_sentiment,
+    "app.tasks.stake_on_sentiment": _stake_on_sentiment,
+}
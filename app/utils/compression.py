@@ -0,0 +1,147 @@
+import zlib
+from typing import Iterable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+
+class _GzipEncoder:
+    name = "gzip"
+
+    def __init__(self, level: int):
+        # wbits=31 writes a gzip header and trailer
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    name = "br"
+
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+def _accepted_encodings(accept_encoding: str) -> set:
+    accepted = set()
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        name, _, value = params.strip().partition("=")
+        try:
+            if name.strip() == "q" and float(value) == 0:
+                continue
+        except ValueError:
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses with Brotli or gzip, whichever the
+    client accepts (Brotli preferred).
+
+    Bodies under `minimum_size` bytes, responses that already have a
+    Content-Encoding and the `skip_types` media types are sent unchanged.
+    Streamed bodies are compressed chunk by chunk and flushed after each one.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        skip_types: Iterable[str] = ("text/event-stream",),
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.skip_types = tuple(skip_types)
+
+    def _encoder(self, scope) -> Optional[object]:
+        accepted = _accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if brotli is not None and "br" in accepted:
+            return _BrotliEncoder(self.brotli_quality)
+        if "gzip" in accepted:
+            return _GzipEncoder(self.gzip_level)
+        return None
+
+    async def __call__(self, scope, receive, send):
+        encoder = self._encoder(scope) if scope["type"] == "http" else None
+        if encoder is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                # Held back until the first body chunk shows whether to compress
+                start_message = message
+                headers = Headers(raw=message["headers"])
+                passthrough = (
+                    "content-encoding" in headers
+                    or headers.get("content-type", "").startswith(self.skip_types)
+                )
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                if start_message is not None:
+                    await send(start_message)
+                    start_message = None
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start_message is not None:
+                headers = MutableHeaders(raw=start_message["headers"])
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    start_message = None
+                    await send(message)
+                    return
+                headers["Content-Encoding"] = encoder.name
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    body = encoder.compress(body) + encoder.finish()
+                    headers["Content-Length"] = str(len(body))
+                    await send(start_message)
+                    start_message = None
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send(start_message)
+                start_message = None
+
+            chunk = encoder.compress(body) + (encoder.flush() if more_body else encoder.finish())
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
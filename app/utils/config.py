@@ -2,6 +2,8 @@
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 import os
+import multiprocessing
+from typing import Dict
 
 load_dotenv(override=True)
 
@@ -29,4 +31,85 @@ class Settings(BaseSettings):
     WALLET_NAME:str =os.getenv("WALLET_NAME")
     WALLET_HOTKEY:str  =os.getenv("WALLET_HOTKEY")
 
+    PASSWORD_HASH_WORKERS: int =int(os.getenv("PASSWORD_HASH_WORKERS", 4))
+    PASSWORD_HASH_CONCURRENCY: int =int(os.getenv("PASSWORD_HASH_CONCURRENCY", 16))
+    LOGIN_RATE_LIMIT: int =int(os.getenv("LOGIN_RATE_LIMIT", 10))
+    LOGIN_RATE_WINDOW: int =int(os.getenv("LOGIN_RATE_WINDOW", 60))
+
+    # Per-endpoint limits: `limit` requests per `window` seconds, plus a daily
+    # `quota` (0 disables it). Override with a JSON object in RATE_LIMITS.
+    RATE_LIMITS: Dict[str, Dict[str, int]] = {
+        "tao_dividends": {"limit": 120, "window": 60, "quota": 50000},
+        "tao_dividends_trade": {"limit": 5, "window": 60, "quota": 200},
+        "operations": {"limit": 60, "window": 60, "quota": 10000},
+        "sentiment": {"limit": 60, "window": 60, "quota": 10000},
+    }
+
+    # Asyncio task worker (app.async_worker)
+    ASYNC_WORKER_CONCURRENCY: int =int(os.getenv("ASYNC_WORKER_CONCURRENCY", 50))
+    ASYNC_WORKER_MAX_RETRIES: int =int(os.getenv("ASYNC_WORKER_MAX_RETRIES", 3))
+    ASYNC_WORKER_RETRY_BACKOFF: float =float(os.getenv("ASYNC_WORKER_RETRY_BACKOFF", 5))
+    ASYNC_WORKER_TASK_TIMEOUT: float =float(os.getenv("ASYNC_WORKER_TASK_TIMEOUT", 300))
+    ASYNC_WORKER_VISIBILITY_TIMEOUT: int =int(os.getenv("ASYNC_WORKER_VISIBILITY_TIMEOUT", 3600))
+
+    SUBTENSOR_NETWORK: str =os.getenv("SUBTENSOR_NETWORK", "finney")
+    # Import bittensor and fetch chain metadata at startup instead of on the first request
+    PRELOAD_SUBTENSOR: bool =os.getenv("PRELOAD_SUBTENSOR", "true").lower() == "true"
+
+    # Second RPC endpoint for hedged chain queries (empty disables hedging)
+    SUBTENSOR_HEDGE_NETWORK: str =os.getenv("SUBTENSOR_HEDGE_NETWORK", "")
+    # Hedge delay until enough latencies are recorded to use their p95
+    SUBTENSOR_HEDGE_DELAY: float =float(os.getenv("SUBTENSOR_HEDGE_DELAY", 1.0))
+
+    # Circuit breakers for the chain, Chutes, Datura and btcli
+    BREAKER_FAILURE_THRESHOLD: int =int(os.getenv("BREAKER_FAILURE_THRESHOLD", 5))
+    BREAKER_RECOVERY_TIMEOUT: float =float(os.getenv("BREAKER_RECOVERY_TIMEOUT", 30))
+    # Failed dividend lookups are remembered this long (seconds) instead of the full cache TTL
+    NEGATIVE_CACHE_TTL: int =int(os.getenv("NEGATIVE_CACHE_TTL", 10))
+
+    # Readiness probes (/health/ready)
+    HEALTH_CACHE_TTL: float =float(os.getenv("HEALTH_CACHE_TTL", 5))
+    HEALTH_PROBE_TIMEOUT: float =float(os.getenv("HEALTH_PROBE_TIMEOUT", 2))
+    # Queue depth reported as a backlog (does not fail readiness)
+    HEALTH_MAX_QUEUE_DEPTH: int =int(os.getenv("HEALTH_MAX_QUEUE_DEPTH", 1000))
+
+    CELERY_METRICS_PORT: int =int(os.getenv("CELERY_METRICS_PORT", 9808))
+
+    # Production server (app.server)
+    SERVER_HOST: str =os.getenv("SERVER_HOST", "0.0.0.0")
+    SERVER_PORT: int =int(os.getenv("SERVER_PORT", 8000))
+    # One async worker per CPU; each opens its own chain websocket and fetches metadata
+    WEB_CONCURRENCY: int =int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+    PRELOAD_APP: bool =os.getenv("PRELOAD_APP", "true").lower() == "true"
+    WORKER_TIMEOUT: int =int(os.getenv("WORKER_TIMEOUT", 60))
+    GRACEFUL_TIMEOUT: int =int(os.getenv("GRACEFUL_TIMEOUT", 30))
+    KEEPALIVE: int =int(os.getenv("KEEPALIVE", 5))
+    MAX_REQUESTS: int =int(os.getenv("MAX_REQUESTS", 10000))
+    MAX_REQUESTS_JITTER: int =int(os.getenv("MAX_REQUESTS_JITTER", 1000))
+    FORWARDED_ALLOW_IPS: str =os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+    PROMETHEUS_MULTIPROC_DIR: str =os.getenv("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus_multiproc")
+
+    # Responses smaller than this are sent uncompressed
+    COMPRESSION_MINIMUM_SIZE: int =int(os.getenv("COMPRESSION_MINIMUM_SIZE", 1024))
+    GZIP_LEVEL: int =int(os.getenv("GZIP_LEVEL", 6))
+    BROTLI_QUALITY: int =int(os.getenv("BROTLI_QUALITY", 4))
+
+    # Update streams (/api/v1/stream, /api/v1/ws)
+    STREAM_QUEUE_SIZE: int =int(os.getenv("STREAM_QUEUE_SIZE", 100))
+    STREAM_HEARTBEAT: float =float(os.getenv("STREAM_HEARTBEAT", 15))
+    STREAM_MAX_SUBSCRIPTIONS: int =int(os.getenv("STREAM_MAX_SUBSCRIPTIONS", 50))
+
+    LOG_LEVEL: str =os.getenv("LOG_LEVEL", "INFO")
+    LOG_JSON: bool =os.getenv("LOG_JSON", "true").lower() == "true"
+    # Per-module overrides, e.g. LOG_LEVELS='{"app.api": "WARNING", "app.tasks": "DEBUG"}'
+    LOG_LEVELS: Dict[str, str] = {}
+    # Fraction of high-volume (sampled_logger) messages that are kept
+    LOG_SAMPLE_RATE: float =float(os.getenv("LOG_SAMPLE_RATE", 0.01))
+
+    OTEL_ENABLED: bool =os.getenv("OTEL_ENABLED", "false").lower() == "true"
+    OTEL_SAMPLE_RATIO: float =float(os.getenv("OTEL_SAMPLE_RATIO", 0.1))
+    OTEL_EXPORTER: str =os.getenv("OTEL_EXPORTER", "otlp")  # "otlp" or "file"
+    OTEL_EXPORTER_OTLP_ENDPOINT: str =os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4317")
+    OTEL_FILE_PATH: str =os.getenv("OTEL_FILE_PATH", "traces.jsonl")
+
 settings = Settings()
\ No newline at end of file
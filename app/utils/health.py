@@ -0,0 +1,87 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.blockchain.subtensor import check_subtensor_connection
+from app.cache.redis import check_redis_connection, redis_client
+from app.db.models import check_db_connection
+from app.utils.config import settings
+from app.utils.metrics import read_queue_depth
+from app.utils.resilience import breaker_states
+from app.worker import CELERY_QUEUES
+
+# Last readiness report and the probe run producing the next one. Load
+# balancer checks within HEALTH_CACHE_TTL are answered from the report, and
+# concurrent checks after it expires share one probe run.
+_report: Optional[Dict[str, Any]] = None
+_report_at = 0.0
+_probing: Optional[asyncio.Future] = None
+
+
+async def _check_redis():
+    if not await check_redis_connection():
+        raise ConnectionError("Redis ping failed")
+
+
+async def _check_substrate():
+    return {"block": await check_subtensor_connection()}
+
+
+async def _check_broker():
+    depth = await read_queue_depth(redis_client, CELERY_QUEUES)
+    backlog = {queue: count for queue, count in depth.items() if count > settings.HEALTH_MAX_QUEUE_DEPTH}
+    return {"depth": depth, "status": "backlogged" if backlog else "ok"}
+
+
+# name -> (probe, whether a failure makes the replica unready). A Celery
+# backlog is reported but does not take the API out of rotation.
+PROBES: Dict[str, tuple] = {
+    "redis": (_check_redis, True),
+    "mongo": (check_db_connection, True),
+    "substrate": (_check_substrate, True),
+    "broker": (_check_broker, False),
+}
+
+
+async def _probe(check: Callable[[], Awaitable]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    try:
+        detail = await asyncio.wait_for(check(), timeout=settings.HEALTH_PROBE_TIMEOUT)
+        result = {"status": "ok"}
+        if isinstance(detail, dict):
+            result.update(detail)
+    except asyncio.TimeoutError:
+        result = {"status": "error", "error": "timed out"}
+    except Exception as e:
+        result = {"status": "error", "error": str(e) or type(e).__name__}
+    result["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+
+async def _run_probes() -> Dict[str, Any]:
+    global _report, _report_at
+    results = await asyncio.gather(*(_probe(check) for check, _ in PROBES.values()))
+    checks = dict(zip(PROBES, results))
+    ready = all(
+        checks[name]["status"] != "error" for name, (_, critical) in PROBES.items() if critical
+    )
+    _report = {
+        "status": "ready" if ready else "not_ready",
+        "checks": checks,
+        "checked_at": datetime.now(timezone.utc).isoformat(),
+    }
+    _report_at = time.monotonic()
+    return _report
+
+
+async def readiness() -> Dict[str, Any]:
+    """Dependency report, probed at most once per HEALTH_CACHE_TTL seconds."""
+    global _probing
+    report = _report
+    if report is None or time.monotonic() - _report_at >= settings.HEALTH_CACHE_TTL:
+        if _probing is None or _probing.done():
+            _probing = asyncio.ensure_future(_run_probes())
+        # Shielded so a client hanging up does not cancel the shared probe run
+        report = await asyncio.shield(_probing)
+    return {**report, "breakers": breaker_states()}
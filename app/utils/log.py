@@ -0,0 +1,73 @@
+import random
+import sys
+
+from loguru import logger
+
+from app.utils.config import settings
+
+# Logger for high-volume messages (cache hits, token checks). Only a
+# LOG_SAMPLE_RATE fraction of its records reaches the sink.
+sampled_logger = logger.bind(sampled=True)
+
+_configured = False
+
+
+def _module_level(name: str, levels: dict, default: int) -> int:
+    """Most specific configured level for a dotted module name."""
+    while name:
+        if name in levels:
+            return levels[name]
+        name = name.rpartition(".")[0]
+    return default
+
+
+def _build_filter():
+    default = logger.level(settings.LOG_LEVEL.upper()).no
+    levels = {module: logger.level(level.upper()).no for module, level in settings.LOG_LEVELS.items()}
+    cache = {}
+    sample_rate = settings.LOG_SAMPLE_RATE
+
+    def log_filter(record) -> bool:
+        name = record["name"] or ""
+        threshold = cache.get(name)
+        if threshold is None:
+            threshold = cache[name] = _module_level(name, levels, default)
+        if record["level"].no < threshold:
+            return False
+        if record["extra"].get("sampled") and record["level"].no < logger.level("WARNING").no:
+            return random.random() < sample_rate
+        return True
+
+    return log_filter
+
+
+def setup_logging():
+    """
+    Replace loguru's default handler with a non-blocking sink.
+
+    Records are handed to a background thread (enqueue=True) so request
+    handlers never wait on stderr, and are serialized as JSON when LOG_JSON is
+    set. Levels can be tuned per module through LOG_LEVELS.
+
+    Called from process entry points (server, lifespan, Celery worker_init,
+    CLIs), never at import, so importers keep their own logging setup.
+    """
+    global _configured
+    if _configured:
+        return
+
+    logger.remove()
+    min_level = min(
+        [logger.level(settings.LOG_LEVEL.upper()).no]
+        + [logger.level(level.upper()).no for level in settings.LOG_LEVELS.values()]
+    )
+    logger.add(
+        sys.stderr,
+        level=min_level,
+        filter=_build_filter(),
+        serialize=settings.LOG_JSON,
+        enqueue=True,
+        backtrace=False,
+        diagnose=False,
+    )
+    _configured = True
@@ -0,0 +1,175 @@
+import functools
+import os
+import time
+from typing import Dict, Iterable, List
+
+from loguru import logger
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+from app.utils.tracing import tracer
+
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+OPERATION_LATENCY = Histogram(
+    "operation_duration_seconds",
+    "Latency of instrumented hot-path operations",
+    ["operation", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Dividend cache lookups by result (hit/miss, negative for a remembered failure)",
+    ["result"],
+)
+CELERY_TASK_DURATION = Histogram(
+    "celery_task_duration_seconds",
+    "Celery task run time",
+    ["task", "state"],
+    buckets=LATENCY_BUCKETS,
+)
+CELERY_QUEUE_WAIT = Histogram(
+    "celery_queue_wait_seconds",
+    "Time a task message waited in its queue before a worker started it",
+    ["queue"],
+    buckets=LATENCY_BUCKETS,
+)
+CIRCUIT_STATE = Gauge(
+    "circuit_breaker_state",
+    "Circuit breaker state (0 closed, 1 half-open, 2 open)",
+    ["breaker"],
+    multiprocess_mode="livemax",
+)
+STREAM_SUBSCRIBERS = Gauge(
+    "stream_subscribers",
+    "Open update stream connections (SSE and WebSocket)",
+    ["transport"],
+    multiprocess_mode="livesum",
+)
+STREAM_DROPPED = Counter(
+    "stream_dropped_messages_total",
+    "Updates dropped because a subscriber was not keeping up",
+)
+CELERY_QUEUE_DEPTH = Gauge(
+    "celery_queue_depth",
+    "Messages waiting in a Celery queue",
+    ["queue"],
+    multiprocess_mode="livemax",
+)
+
+
+class timed:
+    """
+    Record the duration of a block or coroutine function in OPERATION_LATENCY,
+    inside a tracing span of the same name.
+
+    Usable as `with timed("engine_save"): ...` or as a decorator on async functions.
+    """
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self._start = 0.0
+        self._span = None
+
+    def __enter__(self):
+        self._span = tracer.start_as_current_span(self.operation)
+        self._span.__enter__()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        outcome = "error" if exc_type else "ok"
+        OPERATION_LATENCY.labels(self.operation, outcome).observe(time.perf_counter() - self._start)
+        self._span.__exit__(exc_type, exc, tb)
+        return False
+
+    def __call__(self, func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with timed(self.operation):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+
+def metrics_registry() -> CollectorRegistry:
+    """
+    Registry to expose. With PROMETHEUS_MULTIPROC_DIR set (prefork Celery or
+    multi-worker servers) the values of all processes are aggregated.
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def render_metrics():
+    """Return (body, content_type) for a /metrics response."""
+    return generate_latest(metrics_registry()), CONTENT_TYPE_LATEST
+
+
+async def read_queue_depth(redis_client, queues: List[str]) -> Dict[str, int]:
+    """Messages waiting per Celery queue (each is a single Redis list)."""
+    async with redis_client.pipeline(transaction=False) as pipe:
+        for queue in queues:
+            pipe.llen(queue)
+        depths = await pipe.execute()
+    return dict(zip(queues, depths))
+
+
+async def update_queue_depth(redis_client, queues: List[str]):
+    """Refresh CELERY_QUEUE_DEPTH from the Redis broker."""
+    try:
+        for queue, depth in (await read_queue_depth(redis_client, queues)).items():
+            CELERY_QUEUE_DEPTH.labels(queue).set(depth)
+    except Exception as e:
+        logger.error("Failed to read Celery queue depth: {}", e)
+
+
+class PrometheusMiddleware:
+    """ASGI middleware recording REQUEST_LATENCY per route template."""
+
+    def __init__(self, app, skip_paths: Iterable[str] = ("/metrics",)):
+        self.app = app
+        self.skip_paths = set(skip_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched route in the (shared) scope
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            REQUEST_LATENCY.labels(scope["method"], path, str(status_code)).observe(
+                time.perf_counter() - start
+            )
@@ -0,0 +1,176 @@
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type
+
+from loguru import logger
+
+from app.utils.config import settings
+from app.utils.metrics import CIRCUIT_STATE
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# Every breaker created in this process, by name (reported by /health)
+BREAKERS: Dict[str, "CircuitBreaker"] = {}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose breaker is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit '{name}' is open, retry in {math.ceil(retry_after)}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Per-process circuit breaker for one external dependency.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls
+    fail immediately with CircuitOpenError. Once `recovery_timeout` seconds
+    have passed it goes half-open and lets a single probe call through: success
+    closes the circuit, failure opens it again for another timeout.
+
+    Exceptions in `exclude` (e.g. the caller's own bad arguments) say nothing
+    about the dependency's health: they are re-raised without counting as a
+    failure or a success.
+    """
+
+    def __init__(self, name: str, failure_threshold: Optional[int] = None,
+                 recovery_timeout: Optional[float] = None, exclude: Tuple[Type[Exception], ...] = ()):
+        self.name = name
+        self.exclude = exclude
+        self.failure_threshold = failure_threshold or settings.BREAKER_FAILURE_THRESHOLD
+        self.recovery_timeout = recovery_timeout or settings.BREAKER_RECOVERY_TIMEOUT
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        # Bumped on every state change; outcomes of calls that started under
+        # an earlier state are ignored
+        self.generation = 0
+        BREAKERS[name] = self
+        CIRCUIT_STATE.labels(name).set(0)
+
+    def _set_state(self, state: str):
+        if state != self.state:
+            logger.warning("Circuit {} {} -> {}", self.name, self.state, state)
+            self.state = state
+            self.generation += 1
+            CIRCUIT_STATE.labels(self.name).set(_STATE_VALUES[state])
+
+    def retry_after(self) -> float:
+        return max(0.0, self.opened_at + self.recovery_timeout - time.monotonic())
+
+    def _acquire(self) -> bool:
+        """
+        Admit a call or raise CircuitOpenError. Returns whether the call took
+        the half-open probe.
+        """
+        if self.state == OPEN:
+            if self.retry_after() > 0:
+                raise CircuitOpenError(self.name, self.retry_after())
+            self._set_state(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self.probing:
+                raise CircuitOpenError(self.name, self.retry_after())
+            self.probing = True
+            return True
+        return False
+
+    def record_success(self, generation: Optional[int] = None):
+        if generation is not None and generation != self.generation:
+            return
+        self.failures = 0
+        self._set_state(CLOSED)
+
+    def record_failure(self, generation: Optional[int] = None):
+        if generation is not None and generation != self.generation:
+            return
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self._set_state(OPEN)
+
+    async def call(self, func: Callable[..., Awaitable], *args, **kwargs):
+        probe = self._acquire()
+        generation = self.generation
+        try:
+            result = await func(*args, **kwargs)
+        except asyncio.CancelledError:
+            # Abandoned (e.g. the losing side of a hedge): neither outcome
+            raise
+        except self.exclude:
+            raise
+        except Exception:
+            self.record_failure(generation)
+            raise
+        finally:
+            if probe:
+                self.probing = False
+        self.record_success(generation)
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        snapshot = {"state": self.state, "failures": self.failures}
+        if self.state == OPEN:
+            snapshot["retry_after"] = round(self.retry_after(), 1)
+        return snapshot
+
+
+def breaker_states() -> Dict[str, Dict[str, Any]]:
+    return {name: breaker.snapshot() for name, breaker in BREAKERS.items()}
+
+
+class LatencyWindow:
+    """Recent call latencies (seconds), for picking a hedging delay."""
+
+    def __init__(self, size: int = 200):
+        self.samples = deque(maxlen=size)
+
+    def observe(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, pct: float, default: float) -> float:
+        # Too few samples to be meaningful: fall back to the configured value
+        if len(self.samples) < 20:
+            return default
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+async def hedged(primary: Callable[[], Awaitable], backup: Callable[[], Awaitable], delay: float):
+    """
+    Run `primary`; if it has not succeeded within `delay` seconds (or fails
+    before that), start `backup` as well. Returns the first successful result
+    and cancels the other call. Raises the last error if both fail.
+    """
+    first = asyncio.ensure_future(primary())
+    tasks = [first]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done and first.exception() is None:
+            return first.result()
+
+        tasks.append(asyncio.ensure_future(backup()))
+        pending = set(tasks) - done
+        error = first.exception() if done else None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                task.exception()  # mark retrieved; it lost the race
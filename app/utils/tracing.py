@@ -0,0 +1,78 @@
+from loguru import logger
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+
+from app.utils.config import settings
+
+# Spans from this tracer are no-ops until setup_tracing() installs a provider
+tracer = trace.get_tracer("app")
+
+_configured = False
+
+
+def _build_exporter():
+    if settings.OTEL_EXPORTER == "file":
+        out = open(settings.OTEL_FILE_PATH, "a")
+        return ConsoleSpanExporter(out=out, formatter=lambda span: span.to_json(indent=None) + "\n")
+
+    from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+    return OTLPSpanExporter(endpoint=settings.OTEL_EXPORTER_OTLP_ENDPOINT, insecure=True)
+
+
+def instrument_app(app):
+    """
+    Add the FastAPI tracing middleware. Must run before the app starts; spans
+    are only recorded once setup_tracing() has installed the provider.
+    """
+    if not settings.OTEL_ENABLED:
+        return
+
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    FastAPIInstrumentor.instrument_app(app, excluded_urls="metrics,health")
+
+
+def setup_tracing(service_name: str):
+    """
+    Install the tracer provider and instrument httpx, pymongo (Motor), redis
+    and Celery.
+
+    Must run once per process, after any fork: the export thread does not
+    survive it. For prefork Celery call it from worker_process_init.
+    """
+    global _configured
+    if not settings.OTEL_ENABLED or _configured:
+        return
+
+    from opentelemetry.instrumentation.celery import CeleryInstrumentor
+    from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+    from opentelemetry.instrumentation.pymongo import PymongoInstrumentor
+    from opentelemetry.instrumentation.redis import RedisInstrumentor
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": service_name}),
+        sampler=ParentBased(TraceIdRatioBased(settings.OTEL_SAMPLE_RATIO)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(_build_exporter()))
+    trace.set_tracer_provider(provider)
+
+    HTTPXClientInstrumentor().instrument()
+    PymongoInstrumentor().instrument()
+    RedisInstrumentor().instrument()
+    # Injects/extracts trace context through Celery task headers
+    CeleryInstrumentor().instrument()
+
+    _configured = True
+    logger.info(
+        "Tracing enabled for {} (exporter={}, sample_ratio={})",
+        service_name, settings.OTEL_EXPORTER, settings.OTEL_SAMPLE_RATIO
+    )
+
+
+def shutdown_tracing():
+    """Flush pending spans."""
+    provider = trace.get_tracer_provider()
+    if hasattr(provider, "shutdown"):
+        provider.shutdown()
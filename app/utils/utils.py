@@ -6,17 +6,20 @@ from loguru import logger
 from app.api.auth import get_api_key
 from app.cache.redis import get_cache_key, get_cached_data, set_cached_data
 from app.db.models import TaoDividend, User, get_engine
-from app.tasks import analyze_sentiment_and_stake
 
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from pydantic import BaseModel, EmailStr
 from passlib.context import CryptContext
 import jwt
 from bson import ObjectId
+from odmantic.exceptions import DuplicateKeyError
 import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from fastapi import FastAPI, HTTPException, Depends, status
 from app.schema.schema import UserCreate, UserResponse, Token, TokenData
+from app.utils.config import settings
 
 
 # Password hashing
@@ -33,22 +36,40 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 
-def verify_password(plain_password, hashed_password):
-    logger.info(f"Verifying password: {plain_password} against {hashed_password}")
-    return pwd_context.verify(plain_password, hashed_password)
+# bcrypt releases the GIL, so hashing runs on a bounded thread pool instead of
+# stalling the event loop. The semaphore caps queued work during login storms.
+hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="bcrypt"
+)
+_hash_semaphore = None
+
+
+def _get_hash_semaphore():
+    # Created lazily so it binds to the running server loop
+    global _hash_semaphore
+    if _hash_semaphore is None:
+        _hash_semaphore = asyncio.Semaphore(settings.PASSWORD_HASH_CONCURRENCY)
+    return _hash_semaphore
+
+async def _run_in_hash_executor(func, *args):
+    async with _get_hash_semaphore():
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(hash_executor, func, *args)
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+async def verify_password(plain_password, hashed_password):
+    return await _run_in_hash_executor(pwd_context.verify, plain_password, hashed_password)
+
+async def get_password_hash(password):
+    return await _run_in_hash_executor(pwd_context.hash, password)
 
 async def get_user_by_username(username: str):
     engine = await get_engine()
-    users = await engine.find(User, User.username == username)
-    return users[0] if users else None
+    return await engine.find_one(User, User.username == username)
 
 async def get_user_by_email(email: str):
     engine = await get_engine()
-    users = await engine.find(User, User.email == email)
-    return users[0] if users else None
+    return await engine.find_one(User, User.email == email)
 
 async def get_user_by_id(user_id: str):
     try:
@@ -60,37 +81,30 @@ async def get_user_by_id(user_id: str):
         return None
 
 async def create_user(user_data: UserCreate):
-    # Check if email already exists
     engine = await get_engine()
-    existing_user = await get_user_by_email(user_data.email)
-    if existing_user:
-        return None
-    
-    # Check if username already exists
-    existing_user = await get_user_by_username(user_data.username)
-    if existing_user:
-        return None
-    
-    # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash(user_data.password)
     new_user = User(
         email=user_data.email,
         username=user_data.username,
         hashed_password=hashed_password
     )
-    
-    return await engine.save(new_user)
+
+    # Single insert; the unique indexes on email/username reject duplicates
+    try:
+        return await engine.save(new_user)
+    except DuplicateKeyError:
+        logger.info("Registration rejected, duplicate username or email: {}", user_data.username)
+        return None
 
 
 async def authenticate_user(username: str, password: str):
     user = await get_user_by_username(username)
-    logger.info(f"User found: {user}")
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
-        logger.info(f"Password verification failed for user: {username}")
+    if not await verify_password(password, user.hashed_password):
+        logger.info("Password verification failed for user: {}", username)
         return False
-    logger.info(f"Password verified for user: {username}")
+    logger.debug("Password verified for user: {}", username)
     return user
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -1,6 +1,16 @@
 import os
-from celery import Celery
+import time
+from celery import Celery, chain
+from celery.signals import (
+    before_task_publish, task_prerun, task_postrun, worker_init, worker_ready, worker_process_init
+)
 from loguru import logger
+from prometheus_client import start_http_server
+
+from app.utils.config import settings
+from app.utils.metrics import CELERY_QUEUE_WAIT, CELERY_TASK_DURATION, metrics_registry
+from app.utils.tracing import setup_tracing
+from app.utils.log import setup_logging
 
 
 # Configure Celery
@@ -11,9 +21,19 @@ redis_url = f"redis://{redis_host}:{redis_port}/0"
 celery_app = Celery(
     "bittensor_api",
     broker=redis_url,
-    backend=redis_url
+    backend=redis_url,
+    # Task modules are only imported by workers; producers use send_task
+    include=["app.tasks"]
 )
 
+# Pipeline stages get their own queues (and worker pools) so a backlog of
+# analysis work never delays stake submissions
+FETCH_QUEUE = "sentiment.fetch"
+SCORE_QUEUE = "sentiment.score"
+STAKE_QUEUE = "blockchain"
+# Every queue the workers consume, for metrics, probes and worker CLIs
+CELERY_QUEUES = [FETCH_QUEUE, SCORE_QUEUE, STAKE_QUEUE]
+
 # Configure Celery settings
 celery_app.conf.update(
     task_serializer="json",
@@ -24,17 +44,79 @@ celery_app.conf.update(
     worker_prefetch_multiplier=1,
     task_acks_late=True,
     task_reject_on_worker_lost=True,
+    # Each queue holds a single stage, so there is nothing for message
+    # priorities to reorder: every queue is one plain Redis list
     task_routes={
-        "app.tasks.analyze_sentiment_and_stake": {"queue": "blockchain"}
+        "app.tasks.analyze_sentiment_and_stake": {"queue": FETCH_QUEUE},
+        "app.tasks.fetch_tweets": {"queue": FETCH_QUEUE},
+        "app.tasks.score_sentiment": {"queue": SCORE_QUEUE},
+        "app.tasks.stake_on_sentiment": {"queue": STAKE_QUEUE},
     }
 )
 
 
+def sentiment_pipeline(netuid: int, hotkey: str):
+    """
+    fetch tweets -> score -> stake, each stage on its own queue and passing a
+    compact result to the next. Built from task names so producers do not
+    import the task modules.
+    """
+    return chain(
+        celery_app.signature("app.tasks.fetch_tweets", args=(netuid,)),
+        celery_app.signature("app.tasks.score_sentiment", args=(netuid,)),
+        celery_app.signature("app.tasks.stake_on_sentiment", args=(netuid, hotkey)),
+    )
+
+
 # Optional: Configure Celery logging
 @celery_app.on_after_configure.connect
 def setup_celery_logging(sender, **kwargs):
     logger.info("Celery worker started")
 
-import app.tasks
+
+@worker_init.connect
+def init_worker_logging(**kwargs):
+    # In the main worker process, before the pool forks; children inherit the sink
+    setup_logging()
+
+
+@worker_process_init.connect
+def init_worker_tracing(**kwargs):
+    setup_tracing("bittensor-worker")
+
+
+# Task duration metrics. Prefork children only report through the main
+# process when PROMETHEUS_MULTIPROC_DIR is set.
+_task_start_times = {}
+
+
+@worker_ready.connect
+def start_metrics_server(sender, **kwargs):
+    start_http_server(settings.CELERY_METRICS_PORT, registry=metrics_registry())
+    logger.info("Celery metrics exposed on port {}", settings.CELERY_METRICS_PORT)
+
+
+@before_task_publish.connect
+def stamp_publish_time(headers=None, **kwargs):
+    # Lets workers measure how long a message waited in its queue
+    if headers is not None:
+        headers.setdefault("sent_at", time.time())
+
+
+@task_prerun.connect
+def record_task_start(task_id=None, task=None, **kwargs):
+    _task_start_times[task_id] = time.perf_counter()
+    sent_at = task.request.get("sent_at") if task else None
+    if sent_at:
+        queue = (task.request.delivery_info or {}).get("routing_key") or "unknown"
+        CELERY_QUEUE_WAIT.labels(queue).observe(max(0.0, time.time() - sent_at))
+
+
+@task_postrun.connect
+def record_task_duration(task_id=None, task=None, state=None, **kwargs):
+    start = _task_start_times.pop(task_id, None)
+    if start is not None:
+        CELERY_TASK_DURATION.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - start)
+
 if __name__ == "__main__":
     celery_app.start()
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""
+Benchmark runner.
+
+    docker compose -f benchmarks/docker-compose.yml up -d
+    python -m benchmarks micro
+    python -m benchmarks load --requests 2000 --concurrency 50
+    python -m benchmarks analytics --rows 10000000
+    python -m benchmarks all --save benchmarks/baseline.json
+    python -m benchmarks all --compare benchmarks/baseline.json
+
+The celery suite additionally needs the fake Datura/Chutes servers and
+`python -m benchmarks.worker` running (see benchmarks/fakes.py).
+"""
+import argparse
+import asyncio
+import sys
+
+from loguru import logger
+
+from app.utils.config import settings
+from app.utils.log import setup_logging
+from benchmarks.common import compare_baseline, print_results, save_baseline
+from benchmarks.fakes import install_fake_bittensor
+
+
+def _quiet_logging():
+    """
+    Keep the app's request logging out of the measurements. Configured through
+    settings and setup_logging() so later entry points (the app lifespan) see
+    logging as already set up and leave it alone.
+    """
+    settings.LOG_LEVEL = "WARNING"
+    settings.LOG_LEVELS = {}
+    settings.LOG_JSON = False
+    setup_logging()
+
+
+def _logging_levels() -> list:
+    # loguru has no public accessor for handler levels
+    return [handler.levelno for handler in logger._core.handlers.values()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("suite", choices=["micro", "load", "celery", "analytics", "all"])
+    parser.add_argument("--iterations", type=int, default=20000, help="Micro-benchmark iterations")
+    parser.add_argument("--hash-iterations", type=int, default=20, help="bcrypt iterations")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per load scenario")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--stampede-rounds", type=int, default=10)
+    parser.add_argument("--chain-latency", type=float, default=0.05, help="Fake substrate delay (s)")
+    parser.add_argument("--chain-error-rate", type=float, default=0.0)
+    parser.add_argument("--url", help="Load-test a running server instead of the in-process app")
+    parser.add_argument("--tasks", type=int, default=200, help="Tasks for the celery suite")
+    parser.add_argument("--task-timeout", type=float, default=120.0)
+    parser.add_argument("--rows", type=int, default=10_000_000, help="Synthetic rows for the analytics suite")
+    parser.add_argument("--save", metavar="PATH", help="Write results as a baseline JSON file")
+    parser.add_argument("--compare", metavar="PATH", help="Compare results with a baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed regression fraction")
+    args = parser.parse_args()
+
+    _quiet_logging()
+
+    substrate = install_fake_bittensor(latency=args.chain_latency, error_rate=args.chain_error_rate)
+
+    results = {}
+    if args.suite in ("micro", "all"):
+        from benchmarks import micro
+        results.update(micro.run(args.iterations, args.hash_iterations))
+    if args.suite in ("load", "all"):
+        from benchmarks import load
+        results.update(asyncio.run(load.run_api(
+            args.url, args.requests, args.concurrency, args.stampede_rounds,
+            substrate=None if args.url else substrate,
+        )))
+    if args.suite == "celery":
+        from benchmarks import load
+        results["load.celery.sentiment_pipeline"] = load.scenario_celery(args.tasks, args.task_timeout)
+
+    if args.suite == "analytics":
+        from benchmarks import analytics
+        results.update(analytics.run(args.rows))
+
+    print_results(results)
+    warning = logger.level("WARNING").no
+    if _logging_levels() != [warning]:
+        # Something reconfigured logging mid-run: the numbers include log I/O
+        print(f"Logging was reconfigured during the run (handler levels {_logging_levels()})", file=sys.stderr)
+        sys.exit(1)
+    if args.save:
+        save_baseline(args.save, results)
+    if args.compare and not compare_baseline(args.compare, results, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Analytics benchmark on synthetic history (no database needed).
+
+    python -m benchmarks analytics --rows 10000000
+
+Rows are split 60/30/10 between dividend reads, sentiment records and stake
+operations over a year of data for 64 subnets. Each stage of
+app.analytics.analyze is timed separately; `count` is the number of input
+rows and `rps` is rows per second.
+
+`analytics.to_columns` times the loading step of load_history: cursor batches
+of documents (dicts, as Motor returns them) converted to columns and joined.
+Building the documents is not timed, and neither are the Mongo round trips
+and BSON decoding, which need a real database.
+"""
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from benchmarks.common import summarize
+
+YEAR = 365 * 24 * 3600
+
+
+def synthetic_history(rows: int, subnets: int = 64, hotkeys: int = 256, seed: int = 0) -> Tuple[dict, dict, dict]:
+    """Columns shaped like app.analytics.load_history output."""
+    rng = np.random.default_rng(seed)
+    start = int(time.time()) - YEAR
+    n_dividends, n_sentiment = int(rows * 0.6), int(rows * 0.3)
+    n_operations = rows - n_dividends - n_sentiment
+
+    dividends = {
+        "netuid": rng.integers(0, subnets, n_dividends),
+        # Hotkey codes, as produced by load_history
+        "hotkey": rng.integers(0, hotkeys, n_dividends),
+        "dividend": rng.lognormal(18, 1, n_dividends),
+        "timestamp": start + rng.integers(0, YEAR, n_dividends),
+    }
+    sentiment = {
+        "netuid": rng.integers(0, subnets, n_sentiment),
+        "sentiment_score": rng.integers(-100, 101, n_sentiment).astype(np.float64),
+        "timestamp": start + rng.integers(0, YEAR, n_sentiment),
+    }
+    operations = {
+        "netuid": rng.integers(0, subnets, n_operations),
+        "operation_type": np.where(rng.random(n_operations) < 0.5, "stake", "unstake"),
+        "amount": rng.random(n_operations),
+        "successful": rng.random(n_operations) < 0.9,
+        "timestamp": start + rng.integers(0, YEAR, n_operations),
+    }
+    return dividends, sentiment, operations
+
+
+def _documents(columns: dict, start: int, stop: int, hotkeys: List[str]) -> List[dict]:
+    """One cursor batch of the documents behind `columns`."""
+    values = {field: column[start:stop].tolist() for field, column in columns.items()}
+    if "hotkey" in values:
+        values["hotkey"] = [hotkeys[code] for code in values["hotkey"]]
+    values["timestamp"] = [
+        datetime.fromtimestamp(stamp, timezone.utc).replace(tzinfo=None) for stamp in values["timestamp"]
+    ]
+    fields = list(values)
+    return [dict(zip(fields, row)) for row in zip(*values.values())]
+
+
+def _load(tables, batch_size: int) -> float:
+    """Seconds spent turning document batches into columns, for all tables."""
+    from app import analytics
+
+    hotkeys = [f"5{code:047d}" for code in range(1024)]
+    elapsed = 0.0
+    for columns, fields in tables:
+        rows = len(columns["timestamp"])
+        codes, batches = {}, []
+        for start in range(0, rows, batch_size):
+            documents = _documents(columns, start, start + batch_size, hotkeys)
+            started = time.perf_counter()
+            batches.append(analytics.to_columns(documents, fields, codes))
+            elapsed += time.perf_counter() - started
+        started = time.perf_counter()
+        analytics.concat_columns(batches, fields)
+        elapsed += time.perf_counter() - started
+    return elapsed
+
+
+def _stage(name: str, rows: int, func, repeats: int) -> Tuple[Dict[str, float], object]:
+    samples, result = [], None
+    started = time.perf_counter()
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - start) * 1000)
+    elapsed = time.perf_counter() - started
+    row = summarize(samples, elapsed)
+    row["count"] = rows
+    row["rps"] = round(rows * repeats / elapsed, 2)
+    return row, result
+
+
+def run(rows: int = 10_000_000, repeats: int = 1, bucket: int = 3600,
+        batch_size: int = 50_000) -> Dict[str, Dict[str, float]]:
+    from app import analytics
+
+    dividends, sentiment, operations = synthetic_history(rows)
+    results = {}
+
+    tables = [
+        (dividends, analytics.DIVIDEND_FIELDS),
+        (sentiment, analytics.SENTIMENT_FIELDS),
+        (operations, analytics.OPERATION_FIELDS),
+    ]
+    samples = [_load(tables, batch_size) for _ in range(repeats)]
+    row = summarize([sample * 1000 for sample in samples], sum(samples))
+    row["count"] = rows
+    row["rps"] = round(rows * repeats / sum(samples), 2)
+    results["analytics.to_columns"] = row
+
+    results["analytics.dividend_changes"], (change, change_at) = _stage(
+        "dividend_changes", len(dividends["netuid"]), lambda: analytics.dividend_changes(dividends), repeats
+    )
+    grid = analytics.Grid.covering(change_at, sentiment, operations, bucket=bucket)
+
+    def correlate():
+        bucket_change = grid.mean(grid.cells(change_at), change)
+        mean_score = grid.mean(grid.cells(sentiment), sentiment["sentiment_score"])
+        return analytics.masked_correlation(mean_score, analytics.forward_sum(bucket_change, 1))
+
+    results["analytics.correlate"], _ = _stage(
+        "correlate", len(change) + len(sentiment["netuid"]), correlate, repeats
+    )
+    results["analytics.analyze"], _ = _stage(
+        "analyze", rows, lambda: analytics.analyze(dividends, sentiment, operations, bucket=bucket), repeats
+    )
+    return results
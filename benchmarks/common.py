@@ -0,0 +1,100 @@
+"""Shared helpers for the benchmark suites: latency stats and baseline files."""
+import json
+import os
+import platform
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples_ms: List[float], elapsed: float, errors: int = 0) -> Dict[str, float]:
+    """Reduce per-request latencies (ms) and wall time (s) to a result row."""
+    return {
+        "count": len(samples_ms),
+        "errors": errors,
+        "rps": round(len(samples_ms) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(samples_ms, 50), 3),
+        "p95_ms": round(percentile(samples_ms, 95), 3),
+        "p99_ms": round(percentile(samples_ms, 99), 3),
+        "max_ms": round(max(samples_ms, default=0.0), 3),
+    }
+
+
+def print_results(results: Dict[str, Dict[str, float]]):
+    print(f"{'benchmark':<40} {'count':>8} {'err':>5} {'rps':>11} {'p50ms':>9} {'p95ms':>9} {'p99ms':>9}")
+    for name, row in results.items():
+        print(
+            f"{name:<40} {row['count']:>8} {row['errors']:>5} {row['rps']:>11.1f} "
+            f"{row['p50_ms']:>9.3f} {row['p95_ms']:>9.3f} {row['p99_ms']:>9.3f}"
+        )
+
+
+def save_baseline(path: str, results: Dict[str, Dict[str, float]]):
+    payload = {
+        "created_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "host": platform.node(),
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+    print(f"Saved baseline to {path}")
+
+
+def compare_baseline(path: str, results: Dict[str, Dict[str, float]], threshold: float = 0.10) -> bool:
+    """
+    Print the change against a saved baseline. Returns False if any benchmark
+    lost more than `threshold` of its throughput or grew its p95 by as much.
+    """
+    if not os.path.exists(path):
+        print(f"No baseline at {path}, nothing to compare")
+        return True
+
+    with open(path) as f:
+        baseline = json.load(f)["results"]
+
+    ok = True
+    print(f"\nComparison with {path} (threshold {threshold:.0%}):")
+    for name, row in results.items():
+        base = baseline.get(name)
+        if not base:
+            print(f"  {name:<40} new")
+            continue
+        rps_change = (row["rps"] - base["rps"]) / base["rps"] if base["rps"] else 0.0
+        p95_change = (row["p95_ms"] - base["p95_ms"]) / base["p95_ms"] if base["p95_ms"] else 0.0
+        regressed = rps_change < -threshold or p95_change > threshold
+        ok = ok and not regressed
+        print(
+            f"  {name:<40} rps {rps_change:+7.1%}  p95 {p95_change:+7.1%}"
+            f"{'  REGRESSION' if regressed else ''}"
+        )
+    return ok
+
+
+class Timer:
+    """Collect per-iteration latencies in milliseconds."""
+
+    def __init__(self):
+        self.samples: List[float] = []
+        self.errors = 0
+        self.started: Optional[float] = None
+        self.elapsed = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.started
+        return False
+
+    def summary(self) -> Dict[str, float]:
+        return summarize(self.samples, self.elapsed, self.errors)
@@ -0,0 +1,135 @@
+"""
+Local stand-ins for the external dependencies, with configurable latency and
+error rates.
+
+Datura and Chutes are served as real HTTP apps so the production httpx code
+path is exercised:
+
+    python -m benchmarks.fakes datura --port 9001 --latency 0.2 --error-rate 0.02
+    python -m benchmarks.fakes chutes --port 9002 --latency 1.5
+
+then point DATURA_API_URL=http://localhost:9001 and
+CHUTES_API_URL=http://localhost:9002/v1/chat/completions at them.
+
+The substrate node is replaced in-process by install_fake_bittensor(), which
+registers a minimal `bittensor` module whose AsyncSubtensor answers storage
+queries after a simulated delay. Redis and Mongo are real local instances
+(see benchmarks/docker-compose.yml).
+"""
+import argparse
+import asyncio
+import random
+import sys
+import types
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+
+async def _simulate(latency: float, jitter: float, error_rate: float):
+    """Sleep for the configured latency; return True if this call should fail."""
+    delay = max(0.0, random.gauss(latency, latency * jitter)) if latency else 0.0
+    if delay:
+        await asyncio.sleep(delay)
+    return random.random() < error_rate
+
+
+def create_datura_app(latency: float = 0.0, jitter: float = 0.2, error_rate: float = 0.0) -> Starlette:
+    async def twitter(request: Request):
+        if await _simulate(latency, jitter, error_rate):
+            return JSONResponse({"detail": "simulated failure"}, status_code=500)
+        count = int(request.query_params.get("count", 10))
+        query = request.query_params.get("query", "")
+        tweets = [
+            {"id": str(i), "text": f"{query} looks {'great' if i % 3 else 'shaky'} today #{i}", "like_count": i}
+            for i in range(count)
+        ]
+        return JSONResponse(tweets)
+
+    return Starlette(routes=[Route("/twitter", twitter)])
+
+
+def create_chutes_app(latency: float = 0.0, jitter: float = 0.2, error_rate: float = 0.0) -> Starlette:
+    async def completions(request: Request):
+        if await _simulate(latency, jitter, error_rate):
+            return JSONResponse({"detail": "simulated failure"}, status_code=503)
+        await request.json()
+        score = random.randint(-100, 100)
+        return JSONResponse({
+            "choices": [{"message": {"role": "assistant", "content": f'{{"sentiment_score": {score}}}'}}]
+        })
+
+    return Starlette(routes=[Route("/v1/chat/completions", completions, methods=["POST"])])
+
+
+class FakeQueryResult:
+    def __init__(self, value):
+        self.value = value
+
+
+class FakeSubstrate:
+    def __init__(self, latency: float, jitter: float, error_rate: float):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.calls = 0
+
+    async def query(self, module, storage_function, params=None, **kwargs):
+        self.calls += 1
+        if await _simulate(self.latency, self.jitter, self.error_rate):
+            raise ConnectionError("simulated substrate failure")
+        netuid, hotkey = (params or [0, ""])[:2]
+        return FakeQueryResult(abs(hash((netuid, hotkey))) % 10**9)
+
+    async def close(self):
+        pass
+
+
+def install_fake_bittensor(latency: float = 0.05, jitter: float = 0.2, error_rate: float = 0.0) -> FakeSubstrate:
+    """
+    Register a fake `bittensor` module exposing AsyncSubtensor. Must run before
+    the app imports bittensor. Returns the shared FakeSubstrate for inspection.
+    """
+    substrate = FakeSubstrate(latency, jitter, error_rate)
+
+    class AsyncSubtensor:
+        def __init__(self, network=None, *args, **kwargs):
+            self.network = network
+            self.substrate = substrate
+
+        async def initialize(self):
+            return self
+
+        async def get_current_block(self):
+            return 1_000_000
+
+        async def close(self):
+            pass
+
+    module = types.ModuleType("bittensor")
+    module.AsyncSubtensor = AsyncSubtensor
+    sys.modules["bittensor"] = module
+    return substrate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake external API server")
+    parser.add_argument("service", choices=["datura", "chutes"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9001)
+    parser.add_argument("--latency", type=float, default=0.0, help="Mean response delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Delay stddev as a fraction of latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    factory = create_datura_app if args.service == "datura" else create_chutes_app
+    app = factory(args.latency, args.jitter, args.error_rate)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
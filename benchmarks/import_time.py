@@ -0,0 +1,66 @@
+"""
+Import-time report for the API and worker entry points.
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --module app.worker --top 30
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter and
+aggregates the cumulative time per top-level package, so a heavy import
+sneaking into the API start path shows up immediately.
+"""
+import argparse
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+
+def measure(module: str) -> List[Tuple[str, int, int]]:
+    """Return (module, self_us, cumulative_us) rows for importing `module`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr[-2000:]}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.rstrip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def by_package(rows: List[Tuple[str, int, int]]) -> Dict[str, int]:
+    """Sum self time per top-level package."""
+    totals = defaultdict(int)
+    for name, self_us, _ in rows:
+        totals[name.strip().split(".")[0]] += self_us
+    return totals
+
+
+def report(module: str, top: int):
+    rows = measure(module)
+    total_us = sum(self_us for _, self_us, _ in rows)
+    print(f"\n{module}: {total_us / 1e6:.3f}s across {len(rows)} modules")
+
+    print(f"\n  {'package':<32} {'self ms':>10}")
+    for package, self_us in sorted(by_package(rows).items(), key=lambda item: -item[1])[:top]:
+        print(f"  {package:<32} {self_us / 1000:>10.1f}")
+
+    print(f"\n  {'module (cumulative)':<48} {'cum ms':>10}")
+    for name, _, cumulative_us in sorted(rows, key=lambda row: -row[2])[:top]:
+        print(f"  {name.strip():<48} {cumulative_us / 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", action="append", help="Module to import (default: app.main and app.worker)")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    for module in args.module or ["app.main", "app.worker"]:
+        report(module, args.top)
@@ -0,0 +1,155 @@
+"""
+Load scenarios for /tao_dividends and the Celery pipeline.
+
+By default the API runs in-process over httpx.ASGITransport with the fake
+substrate from benchmarks.fakes, against the local Redis and Mongo from
+REDIS_HOST / MONGODB_URL. Client and server share one event loop, so absolute
+numbers are pessimistic; compare runs against a saved baseline instead.
+"""
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import httpx
+import jwt
+
+from benchmarks.common import Timer, summarize
+
+HOTKEY = "5FFApaS75bv5pJHfAp2FVLBj9ZaXuFDjEypsaBNc1wCfe52v"
+BASE58 = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+
+def random_hotkey() -> str:
+    """A well-formed SS58 address nobody has queried yet."""
+    return "5" + "".join(random.choices(BASE58, k=47))
+
+
+def _token() -> str:
+    from app.api.auth import ALGORITHM, SECRET_KEY
+
+    return jwt.encode(
+        {"sub": "bench", "id": f"bench-{uuid.uuid4().hex}", "exp": datetime.utcnow() + timedelta(hours=1)},
+        SECRET_KEY,
+        algorithm=ALGORITHM,
+    )
+
+
+async def _request(client: httpx.AsyncClient, timer: Timer, params: dict, headers: dict):
+    start = time.perf_counter()
+    try:
+        response = await client.get("/api/v1/tao_dividends", params=params, headers=headers)
+        if response.status_code >= 400:
+            timer.errors += 1
+    except httpx.HTTPError:
+        timer.errors += 1
+    timer.samples.append((time.perf_counter() - start) * 1000)
+
+
+async def _run_concurrent(client, params_list: List[dict], concurrency: int, headers: dict) -> Timer:
+    queue: asyncio.Queue = asyncio.Queue()
+    for params in params_list:
+        queue.put_nowait(params)
+    timer = Timer()
+
+    async def worker():
+        while not queue.empty():
+            await _request(client, timer, queue.get_nowait(), headers)
+
+    with timer:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return timer
+
+
+async def _flush_dividend_cache():
+    from app.cache.redis import redis_client
+
+    keys = [key async for key in redis_client.scan_iter("dividend:*")]
+    if keys:
+        await redis_client.delete(*keys)
+
+
+async def scenario_cold(client, headers, requests: int, concurrency: int) -> Dict[str, float]:
+    """Every request misses the cache (distinct hotkeys)."""
+    await _flush_dividend_cache()
+    params = [{"netuid": 18, "hotkey": random_hotkey()} for _ in range(requests)]
+    return (await _run_concurrent(client, params, concurrency, headers)).summary()
+
+
+async def scenario_warm(client, headers, requests: int, concurrency: int) -> Dict[str, float]:
+    """Every request hits one primed cache entry."""
+    params = {"netuid": 18, "hotkey": HOTKEY}
+    await client.get("/api/v1/tao_dividends", params=params, headers=headers)
+    return (await _run_concurrent(client, [params] * requests, concurrency, headers)).summary()
+
+
+async def scenario_stampede(client, headers, rounds: int, concurrency: int, substrate=None) -> Dict[str, float]:
+    """A burst of identical requests arrives right after the entry expires."""
+    params = {"netuid": 18, "hotkey": HOTKEY}
+    samples, errors, elapsed, chain_queries = [], 0, 0.0, 0
+    for _ in range(rounds):
+        await _flush_dividend_cache()
+        calls_before = substrate.calls if substrate else 0
+        timer = await _run_concurrent(client, [params] * concurrency, concurrency, headers)
+        samples.extend(timer.samples)
+        errors += timer.errors
+        elapsed += timer.elapsed
+        if substrate:
+            chain_queries += substrate.calls - calls_before
+    result = summarize(samples, elapsed, errors)
+    if substrate:
+        result["chain_queries_per_round"] = round(chain_queries / rounds, 2)
+    return result
+
+
+def scenario_celery(tasks: int, timeout: float) -> Dict[str, float]:
+    """
+    Start sentiment pipelines and wait for each final (stake) result.
+    Needs workers consuming all stage queues, e.g. `python -m benchmarks.worker`.
+    """
+    from app.worker import sentiment_pipeline
+
+    started = time.perf_counter()
+    pending = [
+        (time.perf_counter(), sentiment_pipeline(18, HOTKEY).apply_async())
+        for _ in range(tasks)
+    ]
+    samples, errors = [], 0
+    for sent_at, result in pending:
+        try:
+            result.get(timeout=timeout, propagate=True)
+        except Exception:
+            errors += 1
+        samples.append((time.perf_counter() - sent_at) * 1000)
+    return summarize(samples, time.perf_counter() - started, errors)
+
+
+async def run_api(url: Optional[str], requests: int, concurrency: int, stampede_rounds: int,
+                  substrate=None) -> Dict[str, Dict[str, float]]:
+    headers = {"Authorization": f"Bearer {_token()}"}
+
+    if url:
+        transport = None
+        base_url = url
+    else:
+        from app.db.models import init_db
+        from app.main import app
+        from app.utils.config import settings
+
+        # Measure the request path, not the limiter
+        settings.RATE_LIMITS.clear()
+        await init_db()
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://bench"
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, limits=limits, timeout=60.0) as client:
+        return {
+            "load.tao_dividends.cold": await scenario_cold(client, headers, requests, concurrency),
+            "load.tao_dividends.warm": await scenario_warm(client, headers, requests, concurrency),
+            "load.tao_dividends.stampede": await scenario_stampede(
+                client, headers, stampede_rounds, concurrency, substrate
+            ),
+        }
@@ -0,0 +1,83 @@
+"""
+Measure /tao_dividends latency while the API is flooded with logins.
+
+Run against a live server:
+
+    python -m benchmarks.login_storm --token <jwt> --username bench --password secret
+
+The dividend endpoint is polled twice: once idle, once during a storm of
+concurrent /login calls. With bcrypt off the event loop both runs should
+report roughly the same percentiles. Start the server with a large
+LOGIN_RATE_LIMIT, otherwise the storm is throttled before it reaches bcrypt.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+import httpx
+
+from benchmarks.common import percentile
+from benchmarks.load import HOTKEY
+
+
+def report(label: str, samples: List[float]):
+    print(
+        f"{label:<12} n={len(samples):<5} "
+        f"p50={percentile(samples, 50):7.1f}ms "
+        f"p95={percentile(samples, 95):7.1f}ms "
+        f"p99={percentile(samples, 99):7.1f}ms "
+        f"max={max(samples, default=0):7.1f}ms "
+        f"mean={statistics.fmean(samples) if samples else 0:7.1f}ms"
+    )
+
+
+async def poll_dividends(client: httpx.AsyncClient, token: str, duration: float) -> List[float]:
+    samples = []
+    headers = {"Authorization": f"Bearer {token}"}
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        await client.get("/api/v1/tao_dividends", params={"netuid": 18, "hotkey": HOTKEY}, headers=headers)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def login_storm(client: httpx.AsyncClient, username: str, password: str,
+                      concurrency: int, duration: float):
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            await client.post(
+                "/api/v1/login",
+                data={"username": username, "password": password},
+            )
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.concurrency + 4)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60.0) as client:
+        idle = await poll_dividends(client, args.token, args.duration)
+        storm_task = asyncio.create_task(
+            login_storm(client, args.username, args.password, args.concurrency, args.duration)
+        )
+        loaded = await poll_dividends(client, args.token, args.duration)
+        await storm_task
+
+    report("idle", idle)
+    report("login storm", loaded)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--token", required=True, help="JWT used for /tao_dividends")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent login clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per phase")
+    asyncio.run(main(parser.parse_args()))
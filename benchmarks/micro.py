@@ -0,0 +1,132 @@
+"""Micro-benchmarks for CPU-bound hot-path helpers."""
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict
+
+import jwt
+
+from benchmarks.common import summarize
+
+CHUTES_RESPONSES = {
+    "json": {"choices": [{"message": {"content": '{"sentiment_score": 42}'}}]},
+    "prose": {"choices": [{"message": {"content": "After reviewing the tweets, sentiment_score: -17 overall."}}]},
+    "no_score": {"choices": [{"message": {"content": "I cannot determine the sentiment of these tweets."}}]},
+}
+
+DIVIDEND_ENTRY = {
+    "netuid": 18,
+    "hotkey": "5FFApaS75bv5pJHfAp2FVLBj9ZaXuFDjEypsaBNc1wCfe52v",
+    "dividend": 123456789,
+    "timestamp": str(datetime.now()),
+    "cached": False,
+}
+
+
+def _bench_sync(func: Callable, iterations: int) -> Dict[str, float]:
+    samples = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples, time.perf_counter() - started)
+
+
+async def _bench_async(func: Callable, iterations: int) -> Dict[str, float]:
+    samples = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples, time.perf_counter() - started)
+
+
+def bench_extract_sentiment_score(iterations: int) -> Dict[str, Dict[str, float]]:
+    from app.sentiment.chutes import extract_sentiment_score
+
+    return {
+        f"micro.extract_sentiment_score.{name}": _bench_sync(lambda r=response: extract_sentiment_score(r), iterations)
+        for name, response in CHUTES_RESPONSES.items()
+    }
+
+
+def bench_cache_codec(iterations: int) -> Dict[str, Dict[str, float]]:
+    from app.cache.redis import decode_cache_value, encode_cache_value
+
+    raw = encode_cache_value(DIVIDEND_ENTRY)
+    return {
+        "micro.cache_codec.encode": _bench_sync(lambda: encode_cache_value(DIVIDEND_ENTRY), iterations),
+        "micro.cache_codec.decode": _bench_sync(lambda: decode_cache_value(raw), iterations),
+    }
+
+
+def bench_render_operations(iterations: int, rows: int = 1000) -> Dict[str, Dict[str, float]]:
+    """Serialize an /operations page: FastAPI's encoder vs orjson, then compress it."""
+    import json
+
+    from fastapi.encoders import jsonable_encoder
+
+    from app.api.responses import dumps
+    from app.db.models import StakeOperation
+    from app.utils.compression import _BrotliEncoder, _GzipEncoder
+
+    operations = [
+        StakeOperation(
+            netuid=18,
+            hotkey=DIVIDEND_ENTRY["hotkey"],
+            operation_type="stake",
+            amount=0.42,
+            sentiment_score=42,
+            successful=True,
+            transaction_hash="transaction_hash",
+        ).model_dump()
+        for _ in range(rows)
+    ]
+    content = {"operations": operations}
+    body = dumps(content)
+
+    def compress(encoder):
+        return encoder.compress(body) + encoder.finish()
+
+    return {
+        "micro.render_operations.jsonable_encoder": _bench_sync(
+            lambda: json.dumps(jsonable_encoder(content)).encode(), iterations
+        ),
+        "micro.render_operations.orjson": _bench_sync(lambda: dumps(content), iterations),
+        "micro.render_operations.gzip": _bench_sync(lambda: compress(_GzipEncoder(6)), iterations),
+        "micro.render_operations.brotli": _bench_sync(lambda: compress(_BrotliEncoder(4)), iterations),
+    }
+
+
+def bench_auth(iterations: int, hash_iterations: int) -> Dict[str, Dict[str, float]]:
+    from app.api.auth import ALGORITHM, SECRET_KEY, get_api_key
+    from app.utils.utils import pwd_context, verify_password
+
+    token = jwt.encode(
+        {"sub": "bench", "id": "bench", "exp": datetime.utcnow() + timedelta(hours=1)},
+        SECRET_KEY,
+        algorithm=ALGORITHM,
+    )
+    header = f"Bearer {token}"
+    hashed = pwd_context.hash("benchmark-password")
+
+    async def run():
+        return {
+            "micro.auth.jwt_validate": await _bench_async(lambda: get_api_key(header), iterations),
+            "micro.auth.bcrypt_verify": await _bench_async(
+                lambda: verify_password("benchmark-password", hashed), hash_iterations
+            ),
+        }
+
+    return asyncio.run(run())
+
+
+def run(iterations: int = 20000, hash_iterations: int = 20) -> Dict[str, Dict[str, float]]:
+    results = {}
+    results.update(bench_extract_sentiment_score(iterations))
+    results.update(bench_cache_codec(iterations))
+    results.update(bench_render_operations(max(1, iterations // 100)))
+    results.update(bench_auth(iterations, hash_iterations))
+    return results
@@ -0,0 +1,29 @@
+"""
+Celery worker wired to the fake substrate, for the Celery throughput scenario.
+
+    DATURA_API_URL=http://localhost:9001 \
+    CHUTES_API_URL=http://localhost:9002/v1/chat/completions \
+    python -m benchmarks.worker --concurrency 8
+"""
+import argparse
+
+from benchmarks.fakes import install_fake_bittensor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--chain-latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    install_fake_bittensor(latency=args.chain_latency)
+
+    from app.worker import CELERY_QUEUES, celery_app
+
+    celery_app.worker_main([
+        "worker", "-Q", ",".join(CELERY_QUEUES), "--loglevel=warning", f"--concurrency={args.concurrency}"
+    ])
+
+
+if __name__ == "__main__":
+    main()
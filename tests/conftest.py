@@ -0,0 +1,10 @@
+import os
+
+# Settings without defaults; placeholders so app modules import without a .env
+for name in (
+    "API_SECRET_KEY", "API_TOKEN", "MONGODB_URL", "MONGODB_DB",
+    "DATURA_API_KEY", "DATURA_API_URL", "CHUTES_API_KEY", "CHUTES_ID", "CHUTES_API_URL",
+    "WALLET_MNEMONIC", "WALLET_NAME", "WALLET_HOTKEY",
+):
+    os.environ.setdefault(name, "test")
+os.environ.setdefault("PRELOAD_SUBTENSOR", "false")
@@ -0,0 +1,189 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app import analytics
+from app.db.models import StakeOperation, TaoDividend
+
+
+def empty(fields) -> analytics.Columns:
+    return analytics.to_columns([], fields)
+
+
+def test_dividend_changes():
+    dividends = {
+        "netuid": np.array([1, 1, 1, 2, 2, 3, 3]),
+        "hotkey": np.array([0, 0, 1, 0, 0, 0, 0]),
+        "dividend": np.array([100.0, 110.0, 50.0, 200.0, 100.0, 0.0, 5.0]),
+        "timestamp": np.array([10, 20, 15, 30, 5, 1, 2]),
+    }
+    change, change_at = analytics.dividend_changes(dividends)
+    # (1, 0): 100 -> 110; (1, 1) has a single read; (2, 0) is stored out of
+    # order (100 at t=5, then 200 at t=30); (3, 0) starts from zero and is skipped
+    np.testing.assert_allclose(change, [0.1, 1.0])
+    np.testing.assert_array_equal(change_at["netuid"], [1, 2])
+    np.testing.assert_array_equal(change_at["timestamp"], [20, 30])
+
+
+def test_dividend_changes_with_string_hotkeys():
+    dividends = {
+        "netuid": np.array([18, 18, 18]),
+        "hotkey": np.array(["5F", "5G", "5F"]),
+        "dividend": np.array([10.0, 7.0, 15.0]),
+        "timestamp": np.array([100, 150, 200]),
+    }
+    change, change_at = analytics.dividend_changes(dividends)
+    np.testing.assert_allclose(change, [0.5])
+    np.testing.assert_array_equal(change_at["timestamp"], [200])
+
+
+def test_dividend_changes_empty():
+    change, change_at = analytics.dividend_changes(empty(analytics.DIVIDEND_FIELDS))
+    assert change.size == 0
+    assert change_at["netuid"].size == 0 and change_at["timestamp"].size == 0
+
+
+def test_forward_sum():
+    matrix = np.array([[1.0, np.nan, 3.0, 4.0], [np.nan, np.nan, np.nan, 2.0]])
+    np.testing.assert_allclose(
+        analytics.forward_sum(matrix, 1),
+        [[np.nan, 3.0, 4.0, np.nan], [np.nan, np.nan, 2.0, np.nan]],
+    )
+    np.testing.assert_allclose(
+        analytics.forward_sum(matrix, 2),
+        [[3.0, 7.0, np.nan, np.nan], [np.nan, 2.0, np.nan, np.nan]],
+    )
+    assert np.isnan(analytics.forward_sum(matrix, 4)).all()
+    assert analytics.forward_sum(np.zeros((0, 1)), 1).shape == (0, 1)
+
+
+def test_masked_correlation():
+    x = np.array([[1.0, 2.0, 3.0, np.nan], [1.0, 2.0, 3.0, 4.0], [1.0, 2.0, np.nan, np.nan]])
+    y = np.array([[2.0, 4.0, 6.0, 1.0], [4.0, 3.0, 2.0, 1.0], [1.0, 2.0, 3.0, 4.0]])
+    r, n = analytics.masked_correlation(x, y)
+    np.testing.assert_allclose(r, [1.0, -1.0, np.nan])
+    np.testing.assert_array_equal(n, [3, 4, 2])
+
+    r, n = analytics.masked_correlation(x.ravel(), y.ravel(), axis=None)
+    assert n == 9
+    assert -1.0 <= r <= 1.0
+
+
+def test_masked_correlation_without_samples():
+    r, n = analytics.masked_correlation(np.array([]), np.array([]), axis=None)
+    assert np.isnan(r) and n == 0
+
+
+def test_backtest():
+    # One rule, one subnet: buy 2, sell 5 (floored at zero), buy 1 in the last bucket
+    trades = np.array([[[2.0, -5.0, 1.0]]])
+    returns = np.array([[np.nan, 0.1, 0.2]])
+    outcome = analytics.backtest(trades, returns)
+    np.testing.assert_allclose(outcome["pnl"], [[0.2]])
+    np.testing.assert_allclose(outcome["turnover"], [[4.0]])
+    np.testing.assert_allclose(outcome["exposure"], [[2.0]])
+    # The last bucket has no following change, so its trade is not taken
+    np.testing.assert_allclose(outcome["final_position"], [[0.0]])
+
+
+def test_backtest_vectorized_over_rules_and_subnets():
+    trades = np.array([
+        [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]],
+        [[0.0, 0.0, 0.0], [3.0, 0.0, 0.0]],
+    ])
+    returns = np.array([[0.0, 0.5, -0.5], [0.0, 0.1, 0.1]])
+    outcome = analytics.backtest(trades, returns)
+    # rule 0: subnet 0 holds 1 for both steps (0.5 - 0.5); subnet 1 holds 1 for the last (0.1)
+    # rule 1: subnet 1 holds 3 for both steps (0.3 + 0.3)
+    np.testing.assert_allclose(outcome["pnl"], [[0.0, 0.1], [0.0, 0.6]])
+    np.testing.assert_allclose(outcome["final_position"], [[1.0, 1.0], [0.0, 3.0]])
+
+
+def test_backtest_empty():
+    outcome = analytics.backtest(np.zeros((5, 0, 1)), np.zeros((0, 1)))
+    assert outcome["pnl"].shape == (5, 0)
+
+
+def test_analyze_empty_collections():
+    results = analytics.analyze(
+        empty(analytics.DIVIDEND_FIELDS), empty(analytics.SENTIMENT_FIELDS), empty(analytics.OPERATION_FIELDS)
+    )
+    correlation = results["sentiment_dividend_correlation"]
+    assert correlation["overall"] == {"correlation": None, "samples": 0}
+    assert correlation["subnets"] == []
+    assert set(results["backtest"]) == set(analytics.RULES) | {analytics.RECORDED}
+    assert results["backtest"]["live"]["pnl"] == 0.0
+    assert results["backtest"]["live"]["return_on_exposure"] is None
+
+
+def test_analyze_replays_recorded_operations():
+    hour = 3600
+    dividends = {
+        "netuid": np.array([18, 18, 18]),
+        "hotkey": np.array([0, 0, 0]),
+        "dividend": np.array([100.0, 100.0, 150.0]),
+        "timestamp": np.array([0, hour, 2 * hour]),
+    }
+    sentiment = {"netuid": np.array([18]), "sentiment_score": np.array([50.0]), "timestamp": np.array([hour])}
+    operations = {
+        "netuid": np.array([18, 18]),
+        "operation_type": np.array(["stake", "unstake"]),
+        "amount": np.array([2.0, 1.0]),
+        "successful": np.array([True, False]),
+        "timestamp": np.array([hour, hour]),
+    }
+    results = analytics.analyze(dividends, sentiment, operations)
+    # Stakes placed in bucket 1 earn bucket 2's +50% change
+    assert results["backtest"]["recorded"]["pnl"] == 1.0
+    assert results["backtest"]["live"]["pnl"] == 0.25
+
+
+class FakeCursor:
+    def __init__(self, documents, batch_size):
+        self.batches = [documents[i:i + batch_size] for i in range(0, len(documents), batch_size)]
+
+    async def to_list(self, length):
+        return self.batches.pop(0) if self.batches else []
+
+
+class FakeEngine:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def get_collection(self, model):
+        engine = self
+
+        class Collection:
+            def find(self, query, projection, batch_size):
+                return FakeCursor(engine.documents.get(model, []), batch_size)
+
+        return Collection()
+
+
+def test_to_columns_keeps_codes_across_batches():
+    codes = {}
+    first = analytics.to_columns([{"hotkey": "a"}, {"hotkey": "b"}], {"hotkey": "category"}, codes)
+    second = analytics.to_columns([{"hotkey": "b"}, {"hotkey": "c"}], {"hotkey": "category"}, codes)
+    np.testing.assert_array_equal(first["hotkey"], [0, 1])
+    np.testing.assert_array_equal(second["hotkey"], [1, 2])
+
+
+@pytest.mark.asyncio
+async def test_load_history_in_batches():
+    at = datetime(2025, 1, 1)
+    dividends = [
+        {"netuid": 18, "hotkey": hotkey, "dividend": float(i), "timestamp": at}
+        for i, hotkey in enumerate(["a", "b", "a", "c", "b"])
+    ]
+    operations = [{"netuid": 1, "operation_type": "stake", "amount": 0.5, "successful": True, "timestamp": at}]
+    engine = FakeEngine({TaoDividend: dividends, StakeOperation: operations})
+
+    loaded, sentiment, stakes = await analytics.load_history(engine, batch_size=2)
+    np.testing.assert_array_equal(loaded["hotkey"], [0, 1, 0, 2, 1])
+    np.testing.assert_array_equal(loaded["dividend"], [0.0, 1.0, 2.0, 3.0, 4.0])
+    assert loaded["timestamp"].dtype == np.int64
+    assert loaded["timestamp"][0] == 1735689600
+    assert sentiment["sentiment_score"].size == 0 and sentiment["timestamp"].dtype == np.int64
+    assert stakes["operation_type"].tolist() == ["stake"]
+    assert stakes["successful"].dtype == np.bool_
@@ -0,0 +1,72 @@
+import fakeredis
+import pytest
+from celery.signals import before_task_publish
+from opentelemetry import propagate, trace
+from opentelemetry.instrumentation.celery import CeleryInstrumentor
+from opentelemetry.sdk.trace import TracerProvider
+
+from app.async_worker import AsyncWorker
+from app.worker import SCORE_QUEUE, celery_app
+
+SCORE_TASK = "app.tasks.score_sentiment"
+STAKE_TASK = "app.tasks.stake_on_sentiment"
+
+
+@pytest.fixture(scope="module", autouse=True)
+def tracing():
+    trace.set_tracer_provider(TracerProvider())
+    instrumentor = CeleryInstrumentor()
+    instrumentor.instrument()
+    yield
+    instrumentor.uninstrument()
+
+
+@pytest.fixture
+def published(monkeypatch):
+    """Headers of every message published, after the instrumentor has injected its context."""
+    # In-memory broker and result backend (the backend is created per thread)
+    monkeypatch.setattr(celery_app.conf, "broker_url", "memory://")
+    monkeypatch.setattr(celery_app.conf, "result_backend", "cache+memory://")
+    seen = []
+
+    def record(headers=None, **kwargs):
+        seen.append(dict(headers))
+
+    before_task_publish.connect(record, weak=False)
+    yield seen
+    before_task_publish.disconnect(record)
+
+
+@pytest.fixture
+def worker():
+    worker = AsyncWorker([SCORE_QUEUE], concurrency=1)
+    worker.client = fakeredis.FakeAsyncRedis(decode_responses=True)
+
+    async def score(tweets, netuid):
+        return {"netuid": netuid, "score": 42}
+
+    worker.tasks = {SCORE_TASK: score}
+    return worker
+
+
+def trace_id(traceparent: str) -> str:
+    return traceparent.split("-")[1]
+
+
+@pytest.mark.asyncio
+async def test_next_chain_link_continues_the_trace(worker, published):
+    producer_headers = {"id": "score-1", "task": SCORE_TASK, "root_id": "fetch-1"}
+    with trace.get_tracer("test").start_as_current_span("producer") as producer:
+        propagate.inject(producer_headers)
+    payload = {"headers": producer_headers, "properties": {}}
+    embed = {"chain": [dict(celery_app.signature(STAKE_TASK, args=(18, "5F")))]}
+
+    await worker._execute(SCORE_QUEUE, "tag-1", payload, SCORE_TASK, (["gm"], 18), {}, embed)
+
+    [headers] = published
+    assert headers["task"] == STAKE_TASK
+    assert headers["root_id"] == "fetch-1"
+    assert headers["parent_id"] == "score-1"
+    assert trace_id(headers["traceparent"]) == format(producer.get_span_context().trace_id, "032x")
+    # Parented on the worker's run span, not directly on the producer
+    assert headers["traceparent"] != producer_headers["traceparent"]
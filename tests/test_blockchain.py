@@ -0,0 +1,77 @@
+import pytest
+
+from app.blockchain import subtensor
+from app.utils.resilience import CLOSED, CircuitBreaker
+
+HOTKEY = "5FFApaS75bv5pJHfAp2FVLBj9ZaXuFDjEypsaBNc1wCfe52v"
+
+
+@pytest.fixture(autouse=True)
+def breaker(monkeypatch):
+    """A fresh primary breaker per test, so failures don't leak between them."""
+    breaker = CircuitBreaker("test_substrate", exclude=subtensor.CALLER_ERRORS)
+    monkeypatch.setattr(subtensor, "substrate_breaker", breaker)
+    return breaker
+
+
+@pytest.mark.parametrize("netuid, hotkey", [
+    (None, HOTKEY),
+    (-1, HOTKEY),
+    (True, HOTKEY),
+    (18, None),
+    (18, ""),
+    (18, "not-an-address"),
+    (18, HOTKEY[:-1] + "0"),
+])
+def test_validate_dividend_query_rejects(netuid, hotkey):
+    with pytest.raises(ValueError):
+        subtensor.validate_dividend_query(netuid, hotkey)
+
+
+def test_validate_dividend_query_accepts():
+    subtensor.validate_dividend_query(0, HOTKEY)
+    subtensor.validate_dividend_query(18, HOTKEY)
+
+
+@pytest.mark.asyncio
+async def test_bad_input_never_reaches_the_chain(monkeypatch, breaker):
+    async def query(*args):
+        raise AssertionError("queried the chain")
+
+    monkeypatch.setattr(subtensor, "_query_dividends", query)
+    for _ in range(breaker.failure_threshold + 1):
+        with pytest.raises(ValueError):
+            await subtensor.get_tao_dividends_per_subnet(None, None)
+    assert breaker.state == CLOSED
+    assert breaker.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_chain_error_is_raised_not_returned(monkeypatch, breaker):
+    async def query(*args):
+        raise ConnectionError("endpoint down")
+
+    monkeypatch.setattr(subtensor, "_query_dividends", query)
+    with pytest.raises(subtensor.ChainQueryError, match="endpoint down"):
+        await subtensor.get_tao_dividends_per_subnet(18, HOTKEY)
+    assert breaker.failures == 1
+
+
+@pytest.mark.asyncio
+async def test_encoding_error_is_a_value_error(monkeypatch, breaker):
+    async def query(*args):
+        raise TypeError("cannot encode")
+
+    monkeypatch.setattr(subtensor, "_query_dividends", query)
+    with pytest.raises(ValueError, match="cannot encode"):
+        await subtensor.get_tao_dividends_per_subnet(18, HOTKEY)
+    assert breaker.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_empty_value_is_returned(monkeypatch):
+    async def query(*args):
+        return None
+
+    monkeypatch.setattr(subtensor, "_query_dividends", query)
+    assert await subtensor.get_tao_dividends_per_subnet(18, HOTKEY) is None
@@ -0,0 +1,31 @@
+import fakeredis
+import pytest
+
+from app.cache import redis as cache
+from app.utils.metrics import CACHE_REQUESTS
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    monkeypatch.setattr(cache, "redis_client", client)
+    return client
+
+
+def count(result: str) -> float:
+    return CACHE_REQUESTS.labels(result)._value.get()
+
+
+@pytest.mark.asyncio
+async def test_cached_failures_are_not_hits(client):
+    before = {result: count(result) for result in ("hit", "miss", "negative")}
+
+    assert await cache.get_cached_data("dividend:18:a") is None
+    await cache.set_cached_failure("dividend:18:a", "Chain query failed")
+    assert cache.is_cached_failure(await cache.get_cached_data("dividend:18:a"))
+    await cache.set_cached_data("dividend:18:b", {"dividend": 7})
+    assert await cache.get_cached_data("dividend:18:b") == {"dividend": 7}
+
+    assert count("miss") - before["miss"] == 1
+    assert count("negative") - before["negative"] == 1
+    assert count("hit") - before["hit"] == 1
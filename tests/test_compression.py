@@ -0,0 +1,139 @@
+import zlib
+
+import brotli
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.utils.compression import CompressionMiddleware, _accepted_encodings
+
+BODY = b"dividend " * 500
+SMALL = b"ok"
+CHUNKS = [b"a" * 2000, b"b" * 2000, b"c" * 10]
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/large")
+    async def large():
+        return PlainTextResponse(BODY)
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse(SMALL)
+
+    @app.get("/encoded")
+    async def encoded():
+        return Response(zlib.compress(BODY), headers={"Content-Encoding": "deflate"})
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for chunk in CHUNKS:
+                yield chunk
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/events")
+    async def events():
+        async def chunks():
+            yield "data: " + "x" * 2000 + "\n\n"
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    return app
+
+
+@pytest.fixture(scope="module")
+def client():
+    return TestClient(make_app())
+
+
+def test_small_body_passes_through(client):
+    response = client.get("/small", headers={"Accept-Encoding": "br, gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["content-length"] == str(len(SMALL))
+    assert response.content == SMALL
+
+
+def test_brotli_preferred(client):
+    response = client.get("/large", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["content-encoding"] == "br"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(BODY)
+    assert response.content == BODY
+
+
+def test_gzip_when_brotli_not_accepted(client):
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == BODY
+
+
+def test_identity_without_accept_encoding(client):
+    response = client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.content == BODY
+
+
+@pytest.mark.parametrize("accept, expected", [
+    ("br;q=0, gzip", "gzip"),
+    ("br;q=0, gzip;q=0", None),
+    ("gzip;q=0.5", "gzip"),
+])
+def test_q_zero_excludes_encoding(client, accept, expected):
+    response = client.get("/large", headers={"Accept-Encoding": accept})
+    assert response.headers.get("content-encoding") == expected
+    assert response.content == BODY
+
+
+def test_accepted_encodings():
+    assert _accepted_encodings("GZIP, br;q=0, deflate;q=bad, *") == {"gzip", "*"}
+    assert _accepted_encodings("") == {""}
+
+
+def test_already_encoded_response_is_untouched(client):
+    response = client.get("/encoded", headers={"Accept-Encoding": "br"})
+    assert response.headers["content-encoding"] == "deflate"
+
+
+def test_streamed_body(client):
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.content == b"".join(CHUNKS)
+
+
+def test_event_stream_is_not_compressed(client):
+    response = client.get("/events", headers={"Accept-Encoding": "br, gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.text.startswith("data: x")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("accept, decoder", [
+    ("gzip", lambda: zlib.decompressobj(31).decompress),
+    ("br", lambda: brotli.Decompressor().process),
+])
+async def test_streamed_chunks_are_flushed(accept, decoder):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+        for i, chunk in enumerate(CHUNKS):
+            await send({"type": "http.response.body", "body": chunk, "more_body": i < len(CHUNKS) - 1})
+
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", accept.encode())]}
+    await CompressionMiddleware(app)(scope, None, send)
+
+    bodies = [message for message in messages if message["type"] == "http.response.body"]
+    assert len(bodies) == len(CHUNKS)
+    # Each chunk decodes on arrival, without waiting for the end of the stream
+    decode = decoder()
+    for message, chunk in zip(bodies, CHUNKS):
+        assert decode(message["body"]) == chunk
+    assert bodies[-1]["more_body"] is False
@@ -0,0 +1,149 @@
+import fakeredis
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import ratelimit
+from app.api.auth import get_api_key
+from app.utils.config import settings
+
+LIMITS = {
+    "dividends": {"limit": 3, "window": 60, "quota": 0},
+    "dividends_trade": {"limit": 1, "window": 60, "quota": 0},
+    "daily": {"limit": 10, "window": 60, "quota": 2},
+}
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    client = fakeredis.FakeAsyncRedis()
+    monkeypatch.setattr(ratelimit, "rate_limit_script", client.register_script(ratelimit.RATE_LIMIT_SCRIPT))
+    monkeypatch.setattr(settings, "RATE_LIMITS", LIMITS)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_window_exhaustion(redis):
+    for remaining in (2, 1, 0):
+        [state] = await ratelimit.check_rate_limits(["dividends"], "user")
+        assert state["allowed"]
+        assert state["remaining"] == remaining
+
+    [state] = await ratelimit.check_rate_limits(["dividends"], "user")
+    assert not state["allowed"]
+    assert state["remaining"] == 0
+    assert 0 < state["reset"] <= 60
+    assert await redis.zcard("ratelimit:dividends:user") == 3
+
+
+@pytest.mark.asyncio
+async def test_identities_are_counted_separately(redis):
+    for _ in range(3):
+        await ratelimit.check_rate_limits(["dividends"], "user")
+    [state] = await ratelimit.check_rate_limits(["dividends"], "other")
+    assert state["allowed"]
+    assert state["remaining"] == 2
+
+
+@pytest.mark.asyncio
+async def test_quota_exhaustion(redis):
+    for quota_remaining in (1, 0):
+        [state] = await ratelimit.check_rate_limits(["daily"], "user")
+        assert state["allowed"]
+        assert state["quota_remaining"] == quota_remaining
+
+    [state] = await ratelimit.check_rate_limits(["daily"], "user")
+    assert not state["allowed"]
+    assert state["remaining"] == 0
+    assert state["quota_remaining"] == 0
+    # Reset is the time left until the quota key expires at UTC midnight
+    assert 0 < state["reset"] <= 86401
+    assert await redis.zcard("ratelimit:daily:user") == 2
+
+
+@pytest.mark.asyncio
+async def test_trade_request_counts_against_both_limits(redis):
+    general, trade = await ratelimit.check_rate_limits(["dividends", "dividends_trade"], "user")
+    assert general["allowed"] and trade["allowed"]
+    assert general["remaining"] == 2
+    assert trade["remaining"] == 0
+
+    # A plain request only uses the general window
+    [general] = await ratelimit.check_rate_limits(["dividends"], "user")
+    assert general["remaining"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rejected_trade_request_is_not_counted(redis):
+    await ratelimit.check_rate_limits(["dividends", "dividends_trade"], "user")
+
+    general, trade = await ratelimit.check_rate_limits(["dividends", "dividends_trade"], "user")
+    assert general["allowed"]
+    assert not trade["allowed"]
+    # Nothing was written: the general window still has one request in it
+    assert general["remaining"] == 2
+    assert await redis.zcard("ratelimit:dividends:user") == 1
+
+
+@pytest.mark.asyncio
+async def test_exhausted_general_limit_does_not_consume_trade_limit(redis):
+    for _ in range(3):
+        await ratelimit.check_rate_limits(["dividends"], "user")
+
+    general, trade = await ratelimit.check_rate_limits(["dividends", "dividends_trade"], "user")
+    assert not general["allowed"]
+    assert trade["allowed"]
+    assert await redis.zcard("ratelimit:dividends_trade:user") == 0
+
+
+@pytest.mark.asyncio
+async def test_unconfigured_endpoint_and_redis_errors_let_requests_through(redis, monkeypatch):
+    assert await ratelimit.check_rate_limits(["unknown"], "user") == []
+
+    async def broken(**kwargs):
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(ratelimit, "rate_limit_script", broken)
+    assert await ratelimit.check_rate_limits(["dividends"], "user") == []
+
+
+def test_headers():
+    state = {"limit": 10, "window": 60, "remaining": 4, "reset": 17, "quota": 200}
+    assert ratelimit.rate_limit_headers(state) == {
+        "RateLimit-Limit": "10",
+        "RateLimit-Remaining": "4",
+        "RateLimit-Reset": "17",
+        "RateLimit-Policy": "10;w=60, 200;w=86400",
+    }
+    assert ratelimit.rate_limit_headers({**state, "quota": 0})["RateLimit-Policy"] == "10;w=60"
+
+
+def test_dependency_sets_headers_and_rejects(redis):
+    app = FastAPI()
+    app.dependency_overrides[get_api_key] = lambda: {"id": "user"}
+
+    @app.get("/dividends", dependencies=[Depends(ratelimit.rate_limit("dividends", "dividends_trade"))])
+    async def dividends():
+        return {}
+
+    client = TestClient(app)
+    response = client.get("/dividends")
+    assert response.status_code == 200
+    assert response.headers["RateLimit-Limit"] == "3"
+    assert response.headers["RateLimit-Remaining"] == "2"
+
+    # Trade requests report the tighter limit
+    response = client.get("/dividends", params={"trade": "true"})
+    assert response.status_code == 200
+    assert response.headers["RateLimit-Limit"] == "1"
+    assert response.headers["RateLimit-Remaining"] == "0"
+
+    response = client.get("/dividends", params={"trade": "true"})
+    assert response.status_code == 429
+    assert response.headers["RateLimit-Limit"] == "1"
+    assert 0 < int(response.headers["Retry-After"]) <= 60
+
+    response = client.get("/dividends")
+    assert response.status_code == 200
+    assert response.headers["RateLimit-Remaining"] == "0"
+    assert client.get("/dividends").status_code == 429
@@ -0,0 +1,301 @@
+import asyncio
+import itertools
+
+import pytest
+
+from app.utils.resilience import (
+    BREAKERS, CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError, LatencyWindow, breaker_states, hedged,
+)
+
+_names = itertools.count()
+
+
+def make_breaker(threshold: int = 2, timeout: float = 30) -> CircuitBreaker:
+    return CircuitBreaker(f"test_{next(_names)}", failure_threshold=threshold, recovery_timeout=timeout)
+
+
+def elapse_recovery(breaker: CircuitBreaker):
+    breaker.opened_at -= breaker.recovery_timeout
+
+
+async def ok():
+    return "ok"
+
+
+async def fail():
+    raise ConnectionError("down")
+
+
+async def trip(breaker: CircuitBreaker):
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(ConnectionError):
+            await breaker.call(fail)
+    assert breaker.state == OPEN
+
+
+@pytest.mark.asyncio
+async def test_opens_after_consecutive_failures():
+    breaker = make_breaker(threshold=3)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await breaker.call(fail)
+    # A success resets the count
+    assert await breaker.call(ok) == "ok"
+    assert breaker.failures == 0
+
+    await trip(breaker)
+    assert breaker_states()[breaker.name]["state"] == OPEN
+    assert BREAKERS[breaker.name] is breaker
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast():
+    breaker = make_breaker()
+    await trip(breaker)
+    calls = []
+
+    async def tracked():
+        calls.append(1)
+
+    with pytest.raises(CircuitOpenError) as error:
+        await breaker.call(tracked)
+    assert calls == []
+    assert 0 < error.value.retry_after <= 30
+    assert "retry in 30s" in str(error.value)
+
+
+@pytest.mark.asyncio
+async def test_half_open_allows_a_single_probe():
+    breaker = make_breaker()
+    await trip(breaker)
+    elapse_recovery(breaker)
+
+    release = asyncio.Event()
+
+    async def slow():
+        await release.wait()
+        return "recovered"
+
+    probe = asyncio.create_task(breaker.call(slow))
+    await asyncio.sleep(0)
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        await breaker.call(ok)
+
+    release.set()
+    assert await probe == "recovered"
+    assert breaker.state == CLOSED
+    assert await breaker.call(ok) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_failed_probe_reopens():
+    breaker = make_breaker()
+    await trip(breaker)
+    elapse_recovery(breaker)
+
+    with pytest.raises(ConnectionError):
+        await breaker.call(fail)
+    assert breaker.state == OPEN
+    assert not breaker.probing
+    assert breaker.retry_after() > 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_frees_the_slot():
+    breaker = make_breaker()
+    await trip(breaker)
+    elapse_recovery(breaker)
+
+    probe = asyncio.create_task(breaker.call(asyncio.sleep, 10))
+    await asyncio.sleep(0)
+    probe.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await probe
+    assert breaker.state == HALF_OPEN
+    assert await breaker.call(ok) == "ok"
+    assert breaker.state == CLOSED
+
+
+@pytest.mark.asyncio
+async def test_stale_call_does_not_release_probe_or_close():
+    breaker = make_breaker()
+    release_stale, release_probe = asyncio.Event(), asyncio.Event()
+
+    async def wait_for(event):
+        await event.wait()
+        return "late"
+
+    # Let through while closed, finishes after the circuit has gone half-open
+    stale = asyncio.create_task(breaker.call(wait_for, release_stale))
+    await asyncio.sleep(0)
+    await trip(breaker)
+    elapse_recovery(breaker)
+    probe = asyncio.create_task(breaker.call(wait_for, release_probe))
+    await asyncio.sleep(0)
+
+    release_stale.set()
+    assert await stale == "late"
+    assert breaker.state == HALF_OPEN
+    assert breaker.probing
+    with pytest.raises(CircuitOpenError):
+        await breaker.call(ok)
+
+    release_probe.set()
+    await probe
+    assert breaker.state == CLOSED
+
+
+@pytest.mark.asyncio
+async def test_stale_failure_is_ignored():
+    breaker = make_breaker()
+    release = asyncio.Event()
+
+    async def fail_later():
+        await release.wait()
+        raise ConnectionError("late")
+
+    stale = asyncio.create_task(breaker.call(fail_later))
+    await asyncio.sleep(0)
+    await trip(breaker)
+    elapse_recovery(breaker)
+    assert await breaker.call(ok) == "ok"
+
+    release.set()
+    with pytest.raises(ConnectionError):
+        await stale
+    assert breaker.state == CLOSED
+    assert breaker.failures == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error", [ValueError("bad netuid"), TypeError("params")])
+async def test_excluded_errors_leave_circuit_closed(error):
+    breaker = CircuitBreaker(f"test_{next(_names)}", failure_threshold=2, exclude=(ValueError, TypeError))
+
+    async def bad_request():
+        raise error
+
+    for _ in range(5):
+        with pytest.raises(type(error)):
+            await breaker.call(bad_request)
+    assert breaker.state == CLOSED
+    assert breaker.failures == 0
+    assert await breaker.call(ok) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_excluded_error_on_probe_frees_the_slot():
+    breaker = CircuitBreaker(f"test_{next(_names)}", failure_threshold=2, exclude=(ValueError,))
+    await trip(breaker)
+    elapse_recovery(breaker)
+
+    async def bad_request():
+        raise ValueError("bad hotkey")
+
+    with pytest.raises(ValueError):
+        await breaker.call(bad_request)
+    assert breaker.state == HALF_OPEN
+    assert not breaker.probing
+    assert await breaker.call(ok) == "ok"
+    assert breaker.state == CLOSED
+
+
+def test_latency_window_percentile():
+    window = LatencyWindow(size=100)
+    for i in range(19):
+        window.observe(i)
+    assert window.percentile(95, default=1.5) == 1.5
+    for i in range(19, 100):
+        window.observe(i)
+    assert window.percentile(95, default=1.5) == 95
+    assert window.percentile(100, default=1.5) == 99
+
+
+def delayed(seconds: float, value=None, error: Exception = None, log: list = None, name: str = None):
+    async def run():
+        if log is not None:
+            log.append(f"{name} started")
+        try:
+            await asyncio.sleep(seconds)
+        except asyncio.CancelledError:
+            if log is not None:
+                log.append(f"{name} cancelled")
+            raise
+        if error is not None:
+            raise error
+        return value
+    return run
+
+
+@pytest.mark.asyncio
+async def test_hedged_primary_wins_before_delay():
+    log = []
+    result = await hedged(
+        delayed(0.01, "primary", log=log, name="primary"),
+        delayed(0, "backup", log=log, name="backup"),
+        delay=1,
+    )
+    assert result == "primary"
+    assert log == ["primary started"]
+
+
+@pytest.mark.asyncio
+async def test_hedged_backup_wins_and_primary_is_cancelled():
+    log = []
+    result = await hedged(
+        delayed(5, "primary", log=log, name="primary"),
+        delayed(0.01, "backup", log=log, name="backup"),
+        delay=0.05,
+    )
+    await asyncio.sleep(0)
+    assert result == "backup"
+    assert log == ["primary started", "backup started", "primary cancelled"]
+
+
+@pytest.mark.asyncio
+async def test_hedged_primary_wins_after_backup_starts():
+    log = []
+    result = await hedged(
+        delayed(0.1, "primary", log=log, name="primary"),
+        delayed(5, "backup", log=log, name="backup"),
+        delay=0.01,
+    )
+    await asyncio.sleep(0)
+    assert result == "primary"
+    assert log == ["primary started", "backup started", "backup cancelled"]
+
+
+@pytest.mark.asyncio
+async def test_hedged_primary_failing_early_starts_backup_at_once():
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    result = await hedged(delayed(0, error=ConnectionError("primary")), delayed(0, "backup"), delay=5)
+    assert result == "backup"
+    assert loop.time() - started < 1
+
+
+@pytest.mark.asyncio
+async def test_hedged_both_fail():
+    with pytest.raises(ConnectionError, match="backup"):
+        await hedged(
+            delayed(0, error=ConnectionError("primary")),
+            delayed(0.01, error=ConnectionError("backup")),
+            delay=5,
+        )
+
+
+@pytest.mark.asyncio
+async def test_hedged_caller_cancellation_cancels_both():
+    log = []
+    call = asyncio.create_task(hedged(
+        delayed(5, log=log, name="primary"),
+        delayed(5, log=log, name="backup"),
+        delay=0.01,
+    ))
+    await asyncio.sleep(0.05)
+    call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await call
+    await asyncio.sleep(0)
+    assert sorted(log) == ["backup cancelled", "backup started", "primary cancelled", "primary started"]
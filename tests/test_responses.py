@@ -0,0 +1,104 @@
+import pytest
+from bson import ObjectId
+from fastapi import Depends, FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from app.api.responses import dumps, etag_matches, json_response, make_etag
+
+ETAG = make_etag("dividend:18:all", 1700000000)
+
+
+def request_with(if_none_match=None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "headers": headers})
+
+
+def test_make_etag_is_weak_and_stable():
+    assert ETAG.startswith('W/"') and ETAG.endswith('"')
+    assert make_etag("dividend:18:all", 1700000000) == ETAG
+    assert make_etag("dividend:18:all", 1700000001) != ETAG
+    # Parts are separated, so shifting a boundary changes the tag
+    assert make_etag("ab", "c") != make_etag("a", "bc")
+
+
+@pytest.mark.parametrize("if_none_match, expected", [
+    (None, False),
+    (ETAG, True),
+    # Weak comparison: the strong form of the same validator matches
+    (ETAG.removeprefix("W/"), True),
+    ('W/"other"', False),
+    ("*", True),
+    (' * ', True),
+    (f'W/"other", {ETAG}', True),
+    (f'"other",{ETAG.removeprefix("W/")}', True),
+    ('W/"one", W/"two"', False),
+])
+def test_etag_matches(if_none_match, expected):
+    assert etag_matches(request_with(if_none_match), ETAG) is expected
+
+
+def test_strong_etag_matches_weak_header():
+    assert etag_matches(request_with('W/"abc"'), '"abc"')
+
+
+def test_dumps_handles_object_ids():
+    object_id = ObjectId()
+    assert dumps({"id": object_id, 18: 1.5}) == f'{{"id":"{object_id}","18":1.5}}'.encode()
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+
+    async def limited(response: Response):
+        # Stands in for the rate limit dependency
+        response.headers["RateLimit-Limit"] = "60"
+        response.headers["RateLimit-Remaining"] = "59"
+
+    @app.get("/operations", dependencies=[Depends(limited)])
+    async def operations(request: Request, response: Response):
+        return json_response(request, [{"netuid": 18, "amount": 0.5}], response)
+
+    @app.get("/dividends", dependencies=[Depends(limited)])
+    async def dividends(request: Request, response: Response):
+        return json_response(request, {"netuid": 18}, response, etag=ETAG)
+
+    return app
+
+
+@pytest.fixture(scope="module")
+def client():
+    return TestClient(make_app())
+
+
+def test_json_response_sets_body_etag(client):
+    response = client.get("/operations")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["ETag"] == make_etag(response.content)
+    assert response.headers["RateLimit-Remaining"] == "59"
+    assert response.json() == [{"netuid": 18, "amount": 0.5}]
+
+
+def test_not_modified_keeps_rate_limit_headers(client):
+    etag = client.get("/operations").headers["ETag"]
+    response = client.get("/operations", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert response.headers["RateLimit-Limit"] == "60"
+    assert response.headers["RateLimit-Remaining"] == "59"
+    # One ETag header, not the dependency's plus ours
+    assert len(response.headers.get_list("ETag")) == 1
+
+
+def test_precomputed_etag(client):
+    response = client.get("/dividends")
+    assert response.status_code == 200
+    assert response.headers["ETag"] == ETAG
+
+    response = client.get("/dividends", headers={"If-None-Match": f'"stale", {ETAG}'})
+    assert response.status_code == 304
+    assert response.headers["RateLimit-Limit"] == "60"
+
+    response = client.get("/dividends", headers={"If-None-Match": '"stale"'})
+    assert response.status_code == 200